@@ -4,11 +4,114 @@
 Enhanced curve editor widget with independent handles option
 """
 
-import numpy as np
+from math import radians as _rad, degrees as _deg, isclose, pi
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-                           QListWidget, QPushButton, QFormLayout, QDoubleSpinBox,
+                           QListView, QPushButton, QFormLayout, QDoubleSpinBox,
                            QGroupBox, QCheckBox, QSlider, QMessageBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import (Qt, QTimer, QSignalBlocker, QObject, QRunnable,
+                          QThreadPool, pyqtSignal, QAbstractListModel,
+                          QModelIndex)
+from utils.nurbs import evaluate_basis
+
+def _wrap_pi(angle):
+    """Wrap an angle in radians to [-π, π)"""
+    return (angle + pi) % (2 * pi) - pi
+
+class _PreviewSignals(QObject):
+    """Signals emitted by a curve preview task"""
+    
+    # (span coefficients, points)
+    finished = pyqtSignal(object, object)
+
+
+class _CurvePreviewTask(QRunnable):
+    """Background task sampling the preview polyline of a curve"""
+    
+    def __init__(self, span_coeffs, basis, signals):
+        """
+        Initialize the task
+        
+        Args:
+            span_coeffs: Span coefficients of the curve (not modified)
+            basis: Sampling basis for the segment count and sample count
+            signals: _PreviewSignals used to report the result
+        """
+        super().__init__()
+        self.span_coeffs = span_coeffs
+        self.basis = basis
+        self.signals = signals
+    
+    def run(self):
+        """Sample the curve and hand the points back to the GUI thread"""
+        points = evaluate_basis(self.span_coeffs, self.basis)
+
+        try:
+            self.signals.finished.emit(self.span_coeffs, points)
+        except RuntimeError:
+            # The editor was deleted while the task was running
+            pass
+
+
+class KnotListModel(QAbstractListModel):
+    """List model showing the knots of a curve"""
+    
+    def __init__(self, parent=None):
+        """Initialize an empty model"""
+        super().__init__(parent)
+        self.curve = None
+        
+        # Number of knots the attached views know about
+        self._row_count = 0
+    
+    def set_curve(self, curve):
+        """
+        Set the curve whose knots are listed
+        
+        Args:
+            curve: NurbsCurve object or None
+        """
+        self.beginResetModel()
+        self.curve = curve
+        self._row_count = len(curve.knots) if curve is not None else 0
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of knots in the curve"""
+        if parent.isValid():
+            return 0
+        return self._row_count
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Label of the knot at the given index"""
+        if role != Qt.DisplayRole or self.curve is None or not index.isValid():
+            return None
+        
+        row = index.row()
+        knot = self.curve.knots[row]
+        return f"Knot {row+1} ({knot.x:.1f}, {knot.y:.1f})"
+    
+    def refresh(self):
+        """Refresh the views after the knots of the curve changed"""
+        count = len(self.curve.knots) if self.curve is not None else 0
+        if count != self._row_count:
+            # Knots were added or removed
+            self.beginResetModel()
+            self._row_count = count
+            self.endResetModel()
+        elif count > 0:
+            # Same number of knots, only the labels changed
+            self.dataChanged.emit(self.index(0), self.index(count - 1), [Qt.DisplayRole])
+    
+    def knot_changed(self, row):
+        """
+        Refresh the label of a single knot
+        
+        Args:
+            row: Index of the knot that changed
+        """
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
 
 class CurveEditor(QWidget):
     """Widget for editing NURBS curves"""
@@ -20,6 +123,33 @@ class CurveEditor(QWidget):
         self.parent = parent
         self.curve = None
         
+        # Image view used for the curve preview (resolved once, see set_curve)
+        self._image_view = getattr(parent, 'image_view', None)
+        
+        # Coalesce bursts of preview requests (e.g. spinbox drags) into a
+        # single curve rebuild per frame
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(16)
+        self._preview_timer.timeout.connect(self._do_update_curve_preview)
+        
+        # The preview polyline is sampled on the thread pool; only one task
+        # runs at a time and requests arriving meanwhile are folded into one
+        self._preview_signals = _PreviewSignals(self)
+        self._preview_signals.finished.connect(self._on_preview_ready)
+        self._preview_in_flight = False
+        self._preview_pending = False
+        
+        # Reduced preview sample count while the tension slider is dragged
+        # (None for the image view's full resolution)
+        self._preview_samples = None
+        
+        # Knot state last shown in the properties panel
+        self._last_shown = None
+        
+        # Warning shown when removing a knot would leave too few (created on first use)
+        self._min_knot_warning = None
+        
         self.init_ui()
         
         # Disable the widget until a curve is selected
@@ -34,8 +164,11 @@ class CurveEditor(QWidget):
         knot_layout = QVBoxLayout(knot_group)
         
         # Knot list
-        self.knot_list = QListWidget()
-        self.knot_list.currentRowChanged.connect(self.on_knot_selected)
+        self.knot_model = KnotListModel(self)
+        self.knot_list = QListView()
+        self.knot_list.setModel(self.knot_model)
+        self.knot_list.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.on_knot_selected(current.row()))
         
         # Knot list buttons
         knot_btn_layout = QHBoxLayout()
@@ -58,9 +191,25 @@ class CurveEditor(QWidget):
         knot_layout.addWidget(self.knot_list)
         knot_layout.addLayout(knot_btn_layout)
         
-        # Knot properties group
-        prop_group = QGroupBox("Knot Properties")
-        prop_layout = QFormLayout(prop_group)
+        # Knot properties group (filled in by _init_props_ui once a curve is set)
+        self.prop_group = QGroupBox("Knot Properties")
+        self._props_built = False
+        
+        # Add groups to main layout
+        layout.addWidget(knot_group)
+        layout.addWidget(self.prop_group)
+        layout.addStretch()
+    
+    def _init_props_ui(self):
+        """Build the knot properties panel on first use"""
+        if self._props_built:
+            return
+        self._props_built = True
+        
+        prop_layout = QFormLayout(self.prop_group)
+        
+        # Spin boxes below only report typed values once they are committed
+        # (Enter or focus change); arrow keys and the mouse wheel stay live
         
         # Position
         pos_layout = QHBoxLayout()
@@ -68,11 +217,13 @@ class CurveEditor(QWidget):
         self.x_pos = QDoubleSpinBox()
         self.x_pos.setRange(0, 10000)
         self.x_pos.setDecimals(1)
+        self.x_pos.setKeyboardTracking(False)
         self.x_pos.valueChanged.connect(self.on_position_changed)
         
         self.y_pos = QDoubleSpinBox()
         self.y_pos.setRange(0, 10000)
         self.y_pos.setDecimals(1)
+        self.y_pos.setKeyboardTracking(False)
         self.y_pos.valueChanged.connect(self.on_position_changed)
         
         pos_layout.addWidget(QLabel("X:"))
@@ -87,6 +238,8 @@ class CurveEditor(QWidget):
         self.tension.setRange(0, 100)
         self.tension.setValue(0)
         self.tension.valueChanged.connect(self.on_tension_changed)
+        self.tension.sliderPressed.connect(self.on_tension_slider_pressed)
+        self.tension.sliderReleased.connect(self.on_tension_slider_released)
         
         self.tension_value = QLabel("0.0")
         
@@ -123,6 +276,7 @@ class CurveEditor(QWidget):
         self.tangent_angle_out.setSingleStep(15)
         self.tangent_angle_out.setValue(0)
         self.tangent_angle_out.setEnabled(False)
+        self.tangent_angle_out.setKeyboardTracking(False)
         self.tangent_angle_out.valueChanged.connect(self.on_tangent_angle_out_changed)
         
         angle_out_layout.addWidget(out_label)
@@ -140,6 +294,7 @@ class CurveEditor(QWidget):
         self.tangent_angle_in.setSingleStep(15)
         self.tangent_angle_in.setValue(0)
         self.tangent_angle_in.setEnabled(False)
+        self.tangent_angle_in.setKeyboardTracking(False)
         self.tangent_angle_in.valueChanged.connect(self.on_tangent_angle_in_changed)
         self.tangent_angle_in_deg_label = QLabel("°")
         
@@ -164,6 +319,7 @@ class CurveEditor(QWidget):
         self.tangent_magnitude_out.setSingleStep(5)
         self.tangent_magnitude_out.setValue(50.0)
         self.tangent_magnitude_out.setEnabled(False)
+        self.tangent_magnitude_out.setKeyboardTracking(False)
         self.tangent_magnitude_out.valueChanged.connect(self.on_tangent_magnitude_out_changed)
         
         magnitude_out_layout.addWidget(out_length_label)
@@ -181,6 +337,7 @@ class CurveEditor(QWidget):
         self.tangent_magnitude_in.setSingleStep(5)
         self.tangent_magnitude_in.setValue(50.0)
         self.tangent_magnitude_in.setEnabled(False)
+        self.tangent_magnitude_in.setKeyboardTracking(False)
         self.tangent_magnitude_in.valueChanged.connect(self.on_tangent_magnitude_in_changed)
         
         magnitude_in_layout.addWidget(in_length_label)
@@ -201,11 +358,6 @@ class CurveEditor(QWidget):
         prop_layout.addRow(magnitude_out_layout)
         prop_layout.addRow(magnitude_in_layout)
         prop_layout.addRow(color_note)
-        
-        # Add groups to main layout
-        layout.addWidget(knot_group)
-        layout.addWidget(prop_group)
-        layout.addStretch()
     
     def set_curve(self, curve):
         """
@@ -215,11 +367,17 @@ class CurveEditor(QWidget):
             curve: NurbsCurve object
         """
         self.curve = curve
+        self._image_view = getattr(self.parent, 'image_view', None)
+        self.knot_model.set_curve(curve)
+        self._init_props_ui()
         
         # Reset edit mode button to unchecked state
         self.edit_knots_btn.setChecked(False)
         
         self.update_knot_list()
+        
+        # The image view shows the selected curve only
+        self.update_curve_preview()
     
     def set_enabled(self, enabled):
         """
@@ -232,135 +390,219 @@ class CurveEditor(QWidget):
         
         if not enabled:
             self.curve = None
-            self.knot_list.clear()
+            self._last_shown = None
+            self.knot_model.set_curve(None)
             self.edit_knots_btn.setChecked(False)
             # Make sure we exit edit mode in the image view
-            if hasattr(self.parent, 'image_view'):
-                self.parent.image_view.mode = "view"
-                self.parent.image_view.setCursor(Qt.ArrowCursor)
-                self.parent.image_view.setDragMode(self.parent.image_view.ScrollHandDrag)
+            if self._image_view is not None:
+                self._image_view.mode = "view"
+                self._image_view.setCursor(Qt.ArrowCursor)
+                self._image_view.setDragMode(self._image_view.ScrollHandDrag)
+    
+    def _current_row(self):
+        """Index of the selected knot, or -1 if none"""
+        return self.knot_list.currentIndex().row()
+    
+    def _current_knot(self):
+        """
+        Selected knot of the curve together with its row
+        
+        Returns:
+            Tuple (row, knot), or None if no knot is selected
+        """
+        if self.curve is None:
+            return None
+        
+        row = self._current_row()
+        if 0 <= row < len(self.curve.knots):
+            return row, self.curve.knots[row]
+        return None
+    
+    def _set_current_row(self, row):
+        """
+        Select a knot in the list
+        
+        Args:
+            row: Index of the knot to select
+        """
+        self.knot_list.setCurrentIndex(self.knot_model.index(row))
     
     def update_knot_list(self):
-        """Update the knot list with current knots from the curve"""
+        """
+        Update the knot list with current knots from the curve
+        
+        Does not touch the curve preview; callers that changed the geometry
+        call update_curve_preview() themselves.
+        """
         if self.curve is None:
             return
         
         # Remember the current selected row
-        current_row = self.knot_list.currentRow()
+        current_row = self._current_row()
         
         # Block signals to avoid triggering callbacks
-        self.knot_list.blockSignals(True)
+        selection_model = self.knot_list.selectionModel()
+        selection_model.blockSignals(True)
         
-        # Clear the list
-        self.knot_list.clear()
-        
-        # Add knot items
-        for i, knot in enumerate(self.curve.knots):
-            self.knot_list.addItem(f"Knot {i+1} ({knot.x:.1f}, {knot.y:.1f})")
+        # Labels are formatted on demand by the model
+        self.knot_model.refresh()
         
         # Restore selection
-        if current_row >= 0 and current_row < self.knot_list.count():
-            self.knot_list.setCurrentRow(current_row)
-        elif self.knot_list.count() > 0:
-            self.knot_list.setCurrentRow(0)
+        count = self.knot_model.rowCount()
+        if current_row >= 0 and current_row < count:
+            self._set_current_row(current_row)
+        elif count > 0:
+            self._set_current_row(0)
         
         # Unblock signals
-        self.knot_list.blockSignals(False)
-        
-        # Update curve preview
-        self.update_curve_preview()
+        selection_model.blockSignals(False)
     
     def update_properties_ui(self):
         """Update the properties UI with the selected knot's values"""
-        if self.curve is None:
+        if self.curve is None or not self._props_built:
             return
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
-        
-        knot = self.curve.knots[current_row]
-        
-        # Block signals to avoid triggering callbacks
-        self.x_pos.blockSignals(True)
-        self.y_pos.blockSignals(True)
-        self.tension.blockSignals(True)
-        self.manual_tangent.blockSignals(True)
-        self.independent_handles.blockSignals(True)
-        self.tangent_angle_out.blockSignals(True)
-        self.tangent_angle_in.blockSignals(True)
-        self.tangent_magnitude_out.blockSignals(True)
-        self.tangent_magnitude_in.blockSignals(True)
-        
-        # Update UI values
-        self.x_pos.setValue(knot.x)
-        self.y_pos.setValue(knot.y)
-        self.tension.setValue(int(knot.tension * 100))
-        self.tension_value.setText(f"{knot.tension:.2f}")
-        
-        has_manual_tangent = knot.tangent_angle is not None
-        self.manual_tangent.setChecked(has_manual_tangent)
-        self.independent_handles.setEnabled(has_manual_tangent)
-        self.tangent_angle_out.setEnabled(has_manual_tangent)
-        self.tangent_magnitude_out.setEnabled(has_manual_tangent)
-        self.tangent_magnitude_in.setEnabled(has_manual_tangent)
-        
-        if has_manual_tangent:
-            # Set independent handles checkbox
-            self.independent_handles.setChecked(knot.independent_handles)
+        current_row, knot = current
+        
+        # Nothing to do if the panel already shows this knot as it is now
+        shown = (self.curve, current_row, len(self.curve.knots), knot.x, knot.y,
+                 knot.tension, knot.tangent_angle, knot.tangent_angle_in,
+                 knot.independent_handles, knot.tangent_magnitude_in,
+                 knot.tangent_magnitude_out)
+        if shown == self._last_shown:
+            return
+        self._last_shown = shown
+        
+        # Repaint once at the end instead of after every widget change
+        self.setUpdatesEnabled(False)
+        try:
+            # Block signals to avoid triggering callbacks; the blockers restore
+            # the previous state when they go out of scope, even on early exit
+            blockers = [QSignalBlocker(w) for w in (
+                self.x_pos, self.y_pos, self.tension, self.manual_tangent,
+                self.independent_handles, self.tangent_angle_out, self.tangent_angle_in,
+                self.tangent_magnitude_out, self.tangent_magnitude_in)]
             
-            # Convert from radians to degrees
-            angle_out_deg = np.degrees(knot.tangent_angle)
-            self.tangent_angle_out.setValue(angle_out_deg)
-            self.tangent_magnitude_out.setValue(knot.tangent_magnitude_out)
-            self.tangent_magnitude_in.setValue(knot.tangent_magnitude_in)
+            # Update UI values
+            self._set_spin_value(self.x_pos, knot.x)
+            self._set_spin_value(self.y_pos, knot.y)
+            self.tension.setValue(round(knot.tension * 100))
+            self.tension_value.setText(f"{knot.tension:.2f}")
             
-            # Handle in angle controls
-            if knot.independent_handles:
-                self.tangent_angle_in_label.setVisible(True)
-                self.tangent_angle_in.setVisible(True)
-                self.tangent_angle_in_deg_label.setVisible(True)
-                self.tangent_angle_in.setEnabled(True)
+            has_manual_tangent = knot.tangent_angle is not None
+            self.manual_tangent.setChecked(has_manual_tangent)
+            self.independent_handles.setEnabled(has_manual_tangent)
+            self.tangent_angle_out.setEnabled(has_manual_tangent)
+            self.tangent_magnitude_out.setEnabled(has_manual_tangent)
+            self.tangent_magnitude_in.setEnabled(has_manual_tangent)
+            
+            if has_manual_tangent:
+                # Set independent handles checkbox
+                self.independent_handles.setChecked(knot.independent_handles)
                 
-                if knot.tangent_angle_in is not None:
-                    # Display the angle from knot to in handle
-                    angle_in_deg = np.degrees(knot.tangent_angle_in)
-                    self.tangent_angle_in.setValue(angle_in_deg)
+                # Convert from radians to degrees
+                angle_out_deg = _deg(knot.tangent_angle)
+                self._set_spin_value(self.tangent_angle_out, angle_out_deg)
+                self._set_spin_value(self.tangent_magnitude_out, knot.tangent_magnitude_out)
+                self._set_spin_value(self.tangent_magnitude_in, knot.tangent_magnitude_in)
+                
+                # Handle in angle controls
+                if knot.independent_handles:
+                    self.tangent_angle_in_label.setVisible(True)
+                    self.tangent_angle_in.setVisible(True)
+                    self.tangent_angle_in_deg_label.setVisible(True)
+                    self.tangent_angle_in.setEnabled(True)
+                    
+                    if knot.tangent_angle_in is not None:
+                        # Display the angle from knot to in handle
+                        angle_in_deg = _deg(knot.tangent_angle_in)
+                        self._set_spin_value(self.tangent_angle_in, angle_in_deg)
+                else:
+                    self.tangent_angle_in_label.setVisible(False)
+                    self.tangent_angle_in.setVisible(False)
+                    self.tangent_angle_in_deg_label.setVisible(False)
             else:
+                self.independent_handles.setChecked(False)
                 self.tangent_angle_in_label.setVisible(False)
                 self.tangent_angle_in.setVisible(False)
                 self.tangent_angle_in_deg_label.setVisible(False)
-        else:
-            self.independent_handles.setChecked(False)
-            self.tangent_angle_in_label.setVisible(False)
-            self.tangent_angle_in.setVisible(False)
-            self.tangent_angle_in_deg_label.setVisible(False)
+            
+            # Unblock signals
+            for blocker in blockers:
+                blocker.unblock()
+            
+            # Enable/disable remove button
+            self.remove_knot_btn.setEnabled(self.knot_model.rowCount() > 2)
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    @staticmethod
+    def _set_spin_value(spin, value):
+        """
+        Set the value of a spin box unless it already holds it
         
-        # Unblock signals
-        self.x_pos.blockSignals(False)
-        self.y_pos.blockSignals(False)
-        self.tension.blockSignals(False)
-        self.manual_tangent.blockSignals(False)
-        self.independent_handles.blockSignals(False)
-        self.tangent_angle_out.blockSignals(False)
-        self.tangent_angle_in.blockSignals(False)
-        self.tangent_magnitude_out.blockSignals(False)
-        self.tangent_magnitude_in.blockSignals(False)
-        
-        # Enable/disable remove button
-        self.remove_knot_btn.setEnabled(self.knot_list.count() > 2)
+        Args:
+            spin: QDoubleSpinBox to update
+            value: New value
+        """
+        if abs(spin.value() - value) > spin.singleStep() * 1e-6:
+            spin.setValue(value)
     
     def update_curve_preview(self):
+        """Schedule a curve preview update (coalesced with pending requests)"""
+        self._preview_timer.start()
+    
+    def _do_update_curve_preview(self):
         """Update the curve preview in the image view"""
         if self.curve is None:
             return
         
-        # Update the curve's B-spline representation
-        self.curve.update_curve()
+        if self._preview_in_flight:
+            # Picked up again once the running task has finished
+            self._preview_pending = True
+            return
         
-        # Update the curve display in the image view
-        if hasattr(self.parent, 'image_view'):
-            self.parent.image_view.update_curve_path(self.curve)
+        # Bring the curve up to date (cheap, and it writes to the knots so it
+        # stays on the GUI thread)
+        num_points = self._preview_samples or getattr(self._image_view, 'curve_samples', 100)
+        snapshot = self.curve.sampling_snapshot(num_points)
+        
+        if self._image_view is None:
+            return
+        
+        if snapshot is None:
+            self._image_view.set_curve_polyline(None)
+            return
+        
+        # Sample the curve display in the background, the snapshot is not
+        # modified by later edits
+        self._preview_in_flight = True
+        span_coeffs, basis = snapshot
+        task = _CurvePreviewTask(span_coeffs, basis, self._preview_signals)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_preview_ready(self, span_coeffs, points):
+        """
+        Show a preview sampled in the background
+        
+        Args:
+            span_coeffs: Span coefficients the points were sampled from
+            points: Sampled curve points
+        """
+        self._preview_in_flight = False
+        
+        # Ignore results for a curve that was rebuilt or replaced meanwhile
+        if self.curve is not None and self._image_view is not None:
+            snapshot = self.curve.sampling_snapshot(len(points))
+            if snapshot is not None and snapshot[0] is span_coeffs:
+                self._image_view.set_curve_polyline(points)
+        
+        if self._preview_pending:
+            self._preview_pending = False
+            self._do_update_curve_preview()
     
     def on_knot_selected(self, row):
         """
@@ -372,12 +614,9 @@ class CurveEditor(QWidget):
         if row < 0:
             return
         
-        # Update properties UI
+        # Update properties UI; the image view draws the handles of every
+        # knot, so a selection change does not touch it
         self.update_properties_ui()
-        
-        # If in edit mode, refresh the display to show correct handles for selected knot
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
     
     def on_add_knot(self):
         """Handle add knot button"""
@@ -395,27 +634,32 @@ class CurveEditor(QWidget):
         if self.curve is None:
             return
         
-        current_row = self.knot_list.currentRow()
+        current_row = self._current_row()
         if current_row < 0 or current_row >= len(self.curve.knots):
             return
         
         # Check if we have enough knots
         if len(self.curve.knots) <= 2:
-            QMessageBox.warning(self, "Warning", "A curve needs at least 2 knots")
+            if self._min_knot_warning is None:
+                self._min_knot_warning = QMessageBox(
+                    QMessageBox.Warning, "Warning", "A curve needs at least 2 knots",
+                    QMessageBox.Ok, self)
+            self._min_knot_warning.exec_()
             return
         
         # Remove the knot
         self.curve.remove_knot(current_row)
         
-        # Update the knot list
+        # Update the knot list and curve
         self.update_knot_list()
+        self.update_curve_preview()
         
         # Select another knot
-        if current_row >= self.knot_list.count():
-            current_row = self.knot_list.count() - 1
+        if current_row >= self.knot_model.rowCount():
+            current_row = self.knot_model.rowCount() - 1
         
         if current_row >= 0:
-            self.knot_list.setCurrentRow(current_row)
+            self._set_current_row(current_row)
     
     def on_edit_knots(self, checked):
         """
@@ -424,36 +668,39 @@ class CurveEditor(QWidget):
         Args:
             checked: Boolean flag indicating if the button is checked
         """
-        if self.curve is None:
+        if self.curve is None or self._image_view is None:
             return
         
         if checked:
             # Enable edit mode in the image view
-            self.parent.image_view.start_editing_curve(self.curve)
+            self._image_view.start_editing_curve(self.curve)
             self.parent.statusBar().showMessage("Edit mode: Click to add knots, drag to move")
         else:
             # Switch back to view mode
-            self.parent.image_view.mode = "view"
-            self.parent.image_view.setCursor(Qt.ArrowCursor)
-            self.parent.image_view.setDragMode(self.parent.image_view.ScrollHandDrag)
+            self._image_view.mode = "view"
+            self._image_view.setCursor(Qt.ArrowCursor)
+            self._image_view.setDragMode(self._image_view.ScrollHandDrag)
             self.parent.statusBar().showMessage("View mode")
     
     def on_position_changed(self):
         """Handle position changed"""
-        if self.curve is None:
-            return
-        
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
         # Update knot position
         x = self.x_pos.value()
         y = self.y_pos.value()
-        self.curve.knots[current_row].set_position(x, y)
+        if knot.x == x and knot.y == y:
+            return  # Re-emitted value, nothing changed
+        knot.set_position(x, y)
         
-        # Update the knot list
-        self.update_knot_list()
+        # Only the selected knot moved, so just relabel its list entry and
+        # move its own marker and handles
+        self.knot_model.knot_changed(current_row)
+        if self._image_view is not None and self._image_view.mode == "edit_curve":
+            self._image_view.refresh_selected_handles(current_row)
         
         # Update curve preview
         self.update_curve_preview()
@@ -465,21 +712,33 @@ class CurveEditor(QWidget):
         Args:
             value: New tension value (0-100)
         """
-        if self.curve is None:
-            return
-        
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
         # Update knot tension
         tension = value / 100.0
-        self.curve.knots[current_row].set_tension(tension)
+        if knot.tension == tension:
+            return
+        knot.set_tension(tension)
         self.tension_value.setText(f"{tension:.2f}")
         
         # Update curve preview
         self.update_curve_preview()
     
+    def on_tension_slider_pressed(self):
+        """Preview less often and at lower resolution while dragging tension"""
+        self._preview_timer.setInterval(50)
+        self._preview_samples = 64
+    
+    def on_tension_slider_released(self):
+        """Restore the preview and show the final tension at full resolution"""
+        self._preview_timer.setInterval(16)
+        self._preview_samples = None
+        self._preview_timer.stop()
+        self._do_update_curve_preview()
+    
     def on_manual_tangent_changed(self, state):
         """
         Handle manual tangent checkbox changed
@@ -487,12 +746,10 @@ class CurveEditor(QWidget):
         Args:
             state: Checkbox state (Qt.Checked or Qt.Unchecked)
         """
-        if self.curve is None:
-            return
-        
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
         # Enable/disable tangent controls
         has_manual_tangent = state == Qt.Checked
@@ -501,12 +758,10 @@ class CurveEditor(QWidget):
         self.tangent_magnitude_out.setEnabled(has_manual_tangent)
         self.tangent_magnitude_in.setEnabled(has_manual_tangent)
         
-        knot = self.curve.knots[current_row]
-        
         # Update knot tangent
         if has_manual_tangent:
             # Convert from degrees to radians
-            angle_rad = np.radians(self.tangent_angle_out.value())
+            angle_rad = _rad(self.tangent_angle_out.value())
             knot.set_tangent(angle_rad, self.tangent_magnitude_out.value(), self.tangent_magnitude_in.value())
             
             # Update UI based on independent handles state
@@ -529,8 +784,8 @@ class CurveEditor(QWidget):
             self.tangent_angle_in_deg_label.setVisible(False)
         
         # Refresh the curve display - this will recreate handles with correct visibility
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
+        if self._image_view is not None and self._image_view.mode == "edit_curve":
+            self._image_view.start_editing_curve(self.curve)
         
         # Update curve preview
         self.update_curve_preview()
@@ -542,14 +797,11 @@ class CurveEditor(QWidget):
         Args:
             state: Checkbox state
         """
-        if self.curve is None:
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
-            return
-        
-        knot = self.curve.knots[current_row]
         knot.independent_handles = state == Qt.Checked
         
         if state == Qt.Checked:
@@ -561,12 +813,9 @@ class CurveEditor(QWidget):
             
             # Initialize in angle if needed
             if knot.tangent_angle_in is None:
-                # Set in handle to opposite of out handle
-                knot.tangent_angle_in = knot.tangent_angle + np.pi
-                # Normalize to [-π, π]
-                if knot.tangent_angle_in > np.pi:
-                    knot.tangent_angle_in -= 2 * np.pi
-                angle_in_deg = np.degrees(knot.tangent_angle_in)
+                # Set in handle to opposite of out handle, normalized to [-π, π)
+                knot.tangent_angle_in = _wrap_pi(knot.tangent_angle + pi)
+                angle_in_deg = _deg(knot.tangent_angle_in)
                 self.tangent_angle_in.setValue(angle_in_deg)
         else:
             # Hide in angle controls
@@ -579,8 +828,8 @@ class CurveEditor(QWidget):
         knot._update_handles()
         
         # Refresh the curve display - this will recreate handles with correct visibility
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
+        if self._image_view is not None and self._image_view.mode == "edit_curve":
+            self._image_view.start_editing_curve(self.curve)
         
         # Update curve preview
         self.update_curve_preview()
@@ -592,24 +841,27 @@ class CurveEditor(QWidget):
         Args:
             value: New angle value in degrees
         """
-        if self.curve is None or not self.manual_tangent.isChecked():
+        if not self.manual_tangent.isChecked():
             return
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
         # Convert from degrees to radians
-        angle_rad = np.radians(value)
+        angle_rad = _rad(value)
+        if knot.tangent_angle is not None and isclose(knot.tangent_angle, angle_rad, abs_tol=1e-12):
+            return
         
         # Update knot tangent
-        knot = self.curve.knots[current_row]
         knot.tangent_angle = angle_rad
         knot._update_handles()
         
-        # Refresh the curve display if in edit mode
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
+        # Move this knot's handles if in edit mode
+        image_view = self._image_view
+        if image_view is not None and image_view.mode == "edit_curve":
+            image_view.refresh_selected_handles(current_row)
         
         # Update curve preview
         self.update_curve_preview()
@@ -621,24 +873,27 @@ class CurveEditor(QWidget):
         Args:
             value: New angle value in degrees
         """
-        if self.curve is None or not self.manual_tangent.isChecked() or not self.independent_handles.isChecked():
+        if not self.manual_tangent.isChecked() or not self.independent_handles.isChecked():
             return
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
             return
+        current_row, knot = current
         
         # Convert from degrees to radians
-        angle_rad = np.radians(value)
+        angle_rad = _rad(value)
+        if knot.tangent_angle_in is not None and isclose(knot.tangent_angle_in, angle_rad, abs_tol=1e-12):
+            return
         
         # Update knot tangent
-        knot = self.curve.knots[current_row]
         knot.tangent_angle_in = angle_rad
         knot._update_handles()
         
-        # Refresh the curve display if in edit mode
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
+        # Move this knot's handles if in edit mode
+        image_view = self._image_view
+        if image_view is not None and image_view.mode == "edit_curve":
+            image_view.refresh_selected_handles(current_row)
         
         # Update curve preview
         self.update_curve_preview()
@@ -650,21 +905,25 @@ class CurveEditor(QWidget):
         Args:
             value: New magnitude value
         """
-        if self.curve is None or not self.manual_tangent.isChecked():
+        if not self.manual_tangent.isChecked():
             return
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
+            return
+        current_row, knot = current
+        
+        if knot.tangent_magnitude_out == value:
             return
         
         # Update knot tangent
-        knot = self.curve.knots[current_row]
         knot.tangent_magnitude_out = value
         knot._update_handles()
         
-        # Refresh the curve display if in edit mode
-        if hasattr(self.parent, 'image_view') and self.parent.image_view.mode == "edit_curve":
-            self.parent.image_view.start_editing_curve(self.curve)
+        # Move this knot's handles if in edit mode
+        image_view = self._image_view
+        if image_view is not None and image_view.mode == "edit_curve":
+            image_view.refresh_selected_handles(current_row)
         
         # Update curve preview
         self.update_curve_preview()
@@ -676,15 +935,18 @@ class CurveEditor(QWidget):
         Args:
             value: New magnitude value
         """
-        if self.curve is None or not self.manual_tangent.isChecked():
+        if not self.manual_tangent.isChecked():
             return
         
-        current_row = self.knot_list.currentRow()
-        if current_row < 0 or current_row >= len(self.curve.knots):
+        current = self._current_knot()
+        if current is None:
+            return
+        current_row, knot = current
+        
+        if knot.tangent_magnitude_in == value:
             return
         
         # Update knot tangent
-        knot = self.curve.knots[current_row]
         knot.tangent_magnitude_in = value
         knot._update_handles()
         
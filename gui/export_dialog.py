@@ -4,15 +4,70 @@
 Export dialog for Plot Digitizer
 """
 
+import io
 import os
-import pandas as pd
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-                           QLabel, QLineEdit, QPushButton, QFileDialog,
-                           QGroupBox, QRadioButton, QButtonGroup, QSpinBox,
-                           QDoubleSpinBox, QTableWidget, QTableWidgetItem,
-                           QHeaderView, QCheckBox, QMessageBox, QTabWidget,
-                           QTextEdit, QWidget)
-from PyQt5.QtCore import Qt
+import numpy as np
+from PyQt5.QtWidgets import (QApplication, QDialog, QVBoxLayout, QHBoxLayout,
+                           QFormLayout, QLabel, QLineEdit, QPushButton,
+                           QFileDialog, QGroupBox, QRadioButton, QButtonGroup,
+                           QSpinBox, QDoubleSpinBox, QTableView, QHeaderView,
+                           QCheckBox, QMessageBox, QTabWidget, QTextEdit,
+                           QWidget)
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
+from utils.sampling import write_csv, export_to_csv
+
+# Display format of sampled values
+_FMT = "{:.6g}".format
+
+class SampledDataModel(QAbstractTableModel):
+    """Table model showing sampled x/y data"""
+    
+    HEADERS = ("X", "Y")
+    
+    def __init__(self, parent=None):
+        """Initialize an empty model"""
+        super().__init__(parent)
+        self._x = []
+        self._y = []
+    
+    def set_data(self, data):
+        """
+        Set the data shown in the table
+        
+        Args:
+            data: Dictionary with x and y value arrays
+        """
+        self.beginResetModel()
+        self._x = data['x']
+        self._y = data['y']
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """Number of samples"""
+        if parent.isValid():
+            return 0
+        return len(self._x)
+    
+    def columnCount(self, parent=QModelIndex()):
+        """One column each for x and y"""
+        if parent.isValid():
+            return 0
+        return 2
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """Formatted value of the cell at the given index"""
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        
+        values = self._x if index.column() == 0 else self._y
+        return _FMT(values[index.row()])
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """Column titles; rows are numbered by Qt"""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
 
 class ExportDialog(QDialog):
     """Dialog for exporting curve data"""
@@ -29,6 +84,24 @@ class ExportDialog(QDialog):
         
         self.curve_data = curve_data
         
+        # (sampling settings, sampled arrays) of the last sampling run
+        self._sample_cache = None
+        
+        # Statistics are only computed while their tab is visible, and only
+        # when the samples changed; (samples, text) of the last computation
+        self._stats_dirty = True
+        self._stats_cache = None
+        
+        # The curve is sampled when the dialog is first shown, not while
+        # it is being built
+        self._shown = False
+        
+        # Resample once typing/spinning in the parameter boxes settles
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(150)
+        self._refresh_timer.timeout.connect(self.refresh)
+        
         self.init_ui()
         self.setWindowTitle("Export Data")
         self.resize(800, 600)
@@ -38,16 +111,17 @@ class ExportDialog(QDialog):
         layout = QVBoxLayout(self)
         
         # Create tabs
-        tabs = QTabWidget()
+        self.tabs = tabs = QTabWidget()
         
         # Data tab
         data_tab = QWidget()
         data_layout = QVBoxLayout(data_tab)
         
-        # Display the sampled data table
-        self.table = QTableWidget()
-        self.table.setColumnCount(2)
-        self.table.setHorizontalHeaderLabels(["X", "Y"])
+        # Display the sampled data table; cells are formatted on demand by
+        # the model, so only the visible rows cost anything
+        self.table_model = SampledDataModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
         data_layout.addWidget(self.table)
@@ -143,28 +217,19 @@ class ExportDialog(QDialog):
         options_layout.addWidget(format_group)
         options_layout.addStretch()
         
-        # Statistics tab
-        stats_tab = QWidget()
-        stats_layout = QVBoxLayout(stats_tab)
-        
-        # Statistics text
-        self.stats_text = QTextEdit()
-        self.stats_text.setReadOnly(True)
-        
-        stats_layout.addWidget(self.stats_text)
+        # Statistics tab, filled in when it is first shown
+        self.stats_tab = stats_tab = QWidget()
+        self.stats_text = None
         
         # Add tabs to tab widget
         tabs.addTab(data_tab, "Data")
         tabs.addTab(options_tab, "Options")
         tabs.addTab(stats_tab, "Statistics")
+        tabs.currentChanged.connect(self.on_tab_changed)
         
         # Add tab widget to main layout
         layout.addWidget(tabs)
         
-        # Now that all UI components are created, update the table and statistics
-        self.update_table()
-        self.update_statistics()
-        
         # Export button
         export_layout = QHBoxLayout()
         
@@ -184,72 +249,153 @@ class ExportDialog(QDialog):
         
         layout.addLayout(export_layout)
     
-    def update_table(self):
-        """Update the table with the current data"""
-        # Sample the curve
-        if self.uniform_sampling.isChecked():
-            data = self.curve_data.sample_uniform(self.num_points.value())
-        else:
-            data = self.curve_data.sample_adaptive(
-                self.max_error.value(),
-                self.min_points.value(),
-                self.max_points.value()
-            )
+    def _init_stats_ui(self):
+        """Build the statistics tab on first use"""
+        if self.stats_text is not None:
+            return
         
-        # Update table
-        self.table.setRowCount(len(data))
+        stats_layout = QVBoxLayout(self.stats_tab)
         
-        for i, (_, row) in enumerate(data.iterrows()):
-            x_item = QTableWidgetItem(f"{row['x']:.6g}")
-            y_item = QTableWidgetItem(f"{row['y']:.6g}")
-            
-            self.table.setItem(i, 0, x_item)
-            self.table.setItem(i, 1, y_item)
+        # Statistics text
+        self.stats_text = QTextEdit()
+        self.stats_text.setReadOnly(True)
+        
+        stats_layout.addWidget(self.stats_text)
     
-    def update_statistics(self):
-        """Update the statistics text with data stats"""
-        # Sample the curve
+    def showEvent(self, event):
+        """Sample the curve and fill the table when first shown"""
+        super().showEvent(event)
+        
+        if not self._shown:
+            self._shown = True
+            self.refresh()
+    
+    def _sampling_key(self):
+        """Tuple describing the current sampling settings"""
         if self.uniform_sampling.isChecked():
-            data = self.curve_data.sample_uniform(self.num_points.value())
-        else:
-            data = self.curve_data.sample_adaptive(
-                self.max_error.value(),
-                self.min_points.value(),
-                self.max_points.value()
-            )
+            return ('uniform', self.num_points.value())
+        return ('adaptive', self.max_error.value(),
+                self.min_points.value(), self.max_points.value())
+    
+    def _get_sampled_data(self):
+        """
+        Sample the curve with the current settings
         
-        # Calculate statistics
-        stats = {
-            'Number of points': len(data),
-            'X range': (data['x'].min(), data['x'].max()),
-            'Y range': (data['y'].min(), data['y'].max()),
-            'X mean': data['x'].mean(),
-            'Y mean': data['y'].mean(),
-            'X median': data['x'].median(),
-            'Y median': data['y'].median(),
-            'X std dev': data['x'].std(),
-            'Y std dev': data['y'].std()
-        }
+        The result is reused until the settings change, so the table, the
+        statistics and export/copy all share one sampling run.
         
-        # Format statistics text
-        stats_text = "Data Statistics:\n\n"
+        Returns:
+            Dictionary with x and y value arrays
+        """
+        key = self._sampling_key()
+        if self._sample_cache is not None and self._sample_cache[0] == key:
+            return self._sample_cache[1]
+        
+        if key[0] == 'uniform':
+            frame = self.curve_data.sample_uniform(key[1])
+        else:
+            frame = self.curve_data.sample_adaptive(*key[1:])
         
-        stats_text += f"Number of points: {stats['Number of points']}\n\n"
+        # The dialog only needs the raw columns, not the DataFrame
+        data = {name: frame[name].to_numpy(dtype=float) for name in ('x', 'y')}
+        
+        self._sample_cache = (key, data)
+        return data
+    
+    def refresh(self):
+        """Update the table and statistics from the current samples"""
+        self.update_table()
         
-        stats_text += f"X range: {stats['X range'][0]:.6g} to {stats['X range'][1]:.6g}\n"
-        stats_text += f"Y range: {stats['Y range'][0]:.6g} to {stats['Y range'][1]:.6g}\n\n"
+        if self.tabs.currentWidget() is self.stats_tab:
+            self.update_statistics()
+        else:
+            self._stats_dirty = True
+    
+    def on_tab_changed(self, index):
+        """
+        Handle tab switched, bringing the statistics up to date when shown
         
-        stats_text += f"X mean: {stats['X mean']:.6g}\n"
-        stats_text += f"Y mean: {stats['Y mean']:.6g}\n\n"
+        Args:
+            index: Index of the newly shown tab
+        """
+        if self.tabs.widget(index) is self.stats_tab and self._stats_dirty:
+            self.update_statistics()
+    
+    def update_table(self):
+        """Update the table with the current data"""
+        data = self._get_sampled_data()
         
-        stats_text += f"X median: {stats['X median']:.6g}\n"
-        stats_text += f"Y median: {stats['Y median']:.6g}\n\n"
+        # Update table
+        self.table_model.set_data(data)
+    
+    def update_statistics(self):
+        """Update the statistics text with data stats"""
+        self._init_stats_ui()
+        data = self._get_sampled_data()
+        self._stats_dirty = False
         
-        stats_text += f"X standard deviation: {stats['X std dev']:.6g}\n"
-        stats_text += f"Y standard deviation: {stats['Y std dev']:.6g}\n"
+        # The text already shows the statistics of these samples
+        if self._stats_cache is not None and self._stats_cache[0] is data:
+            return
         
         # Set the statistics text
+        stats_text = self._format_statistics(data)
         self.stats_text.setText(stats_text)
+        self._stats_cache = (data, stats_text)
+    
+    @staticmethod
+    def _format_statistics(data):
+        """
+        Describe sampled data in a few basic statistics
+        
+        Args:
+            data: Dictionary with x and y value arrays
+            
+        Returns:
+            Text listing the statistics
+        """
+        # Calculate statistics, one reduction over both columns at a time
+        values = np.column_stack((data['x'], data['y']))
+        if len(values):
+            lo, hi = values.min(axis=0), values.max(axis=0)
+            mean = values.mean(axis=0)
+            median = np.median(values, axis=0)
+            std = values.std(axis=0, ddof=1)  # sample std like pandas
+        else:
+            lo = hi = mean = median = std = np.full(2, np.nan)
+        
+        stats = {
+            'Number of points': len(values),
+            'X range': (lo[0], hi[0]),
+            'Y range': (lo[1], hi[1]),
+            'X mean': mean[0],
+            'Y mean': mean[1],
+            'X median': median[0],
+            'Y median': median[1],
+            'X std dev': std[0],
+            'Y std dev': std[1]
+        }
+        
+        # Format statistics text
+        lines = [
+            "Data Statistics:",
+            "",
+            f"Number of points: {stats['Number of points']}",
+            "",
+            f"X range: {_FMT(stats['X range'][0])} to {_FMT(stats['X range'][1])}",
+            f"Y range: {_FMT(stats['Y range'][0])} to {_FMT(stats['Y range'][1])}",
+            "",
+            f"X mean: {_FMT(stats['X mean'])}",
+            f"Y mean: {_FMT(stats['Y mean'])}",
+            "",
+            f"X median: {_FMT(stats['X median'])}",
+            f"Y median: {_FMT(stats['Y median'])}",
+            "",
+            f"X standard deviation: {_FMT(stats['X std dev'])}",
+            f"Y standard deviation: {_FMT(stats['Y std dev'])}",
+            ""
+        ]
+        return "\n".join(lines)
     
     def on_sampling_changed(self):
         """Handle sampling method changed"""
@@ -261,14 +407,13 @@ class ExportDialog(QDialog):
         self.max_points.setEnabled(self.adaptive_sampling.isChecked())
         
         # Update the table and statistics
-        self.update_table()
-        self.update_statistics()
+        self._refresh_timer.stop()
+        self.refresh()
     
     def on_sampling_params_changed(self):
         """Handle sampling parameters changed"""
-        # Update the table and statistics
-        self.update_table()
-        self.update_statistics()
+        # Update the table and statistics after a short pause
+        self._refresh_timer.start()
     
     def on_export(self):
         """Handle export button"""
@@ -283,29 +428,12 @@ class ExportDialog(QDialog):
         if not filename.endswith(".csv"):
             filename += ".csv"
         
-        # Sample the curve
-        if self.uniform_sampling.isChecked():
-            data = self.curve_data.sample_uniform(self.num_points.value())
-        else:
-            data = self.curve_data.sample_adaptive(
-                self.max_error.value(),
-                self.min_points.value(),
-                self.max_points.value()
-            )
+        data = self._get_sampled_data()
         
         try:
             # Export based on orientation
-            if self.by_column.isChecked():
-                if not self.include_header.isChecked():
-                    data.to_csv(filename, index=False, header=False)
-                else:
-                    data.to_csv(filename, index=False)
-            else:
-                data_t = data.T
-                if not self.include_header.isChecked():
-                    data_t.to_csv(filename, index=False, header=False)
-                else:
-                    data_t.to_csv(filename, index=False)
+            export_to_csv(data, filename, self.by_column.isChecked(),
+                          self.include_header.isChecked())
             
             QMessageBox.information(self, "Success", f"Data exported to {filename}")
         except Exception as e:
@@ -313,27 +441,16 @@ class ExportDialog(QDialog):
     
     def on_copy(self):
         """Handle copy to clipboard button"""
-        # Sample the curve
-        if self.uniform_sampling.isChecked():
-            data = self.curve_data.sample_uniform(self.num_points.value())
-        else:
-            data = self.curve_data.sample_adaptive(
-                self.max_error.value(),
-                self.min_points.value(),
-                self.max_points.value()
-            )
+        data = self._get_sampled_data()
         
         try:
             # Export to clipboard based on orientation
-            if self.by_column.isChecked():
-                text = data.to_csv(index=False, header=self.include_header.isChecked())
-            else:
-                data_t = data.T
-                text = data_t.to_csv(index=False, header=self.include_header.isChecked())
+            buffer = io.StringIO()
+            write_csv(buffer, data, self.by_column.isChecked(),
+                      self.include_header.isChecked())
             
             # Copy to clipboard
-            clipboard = self.parent().parent().clipboard()
-            clipboard.setText(text)
+            QApplication.clipboard().setText(buffer.getvalue())
             
             QMessageBox.information(self, "Success", "Data copied to clipboard")
         except Exception as e:
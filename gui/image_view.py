@@ -5,37 +5,180 @@ Enhanced image view widget with graphical tangent handles
 """
 
 import numpy as np
-from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsPixmapItem,
-                            QGraphicsEllipseItem, QGraphicsLineItem,
-                            QGraphicsTextItem, QGraphicsPathItem)
+from PyQt5.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsItem,
+                            QGraphicsPixmapItem, QGraphicsEllipseItem,
+                            QGraphicsLineItem, QGraphicsPathItem,
+                            QOpenGLWidget)
 from PyQt5.QtGui import (QPixmap, QImage, QPen, QColor, QBrush, QPainterPath,
-                        QCursor, QPolygonF, QPainter)
-from PyQt5.QtCore import Qt, QPointF, QRectF, pyqtSignal
+                        QCursor, QPolygonF, QPainter, QSurfaceFormat, QFont,
+                        QFontMetrics, QOpenGLContext)
+from PyQt5.QtCore import (Qt, QPointF, QRectF, QByteArray, QDataStream, QTimer,
+                          QObject, QRunnable, QThreadPool, pyqtSignal)
 from utils.nurbs import NurbsKnot
 
+# Shared colors, pens and brushes. Items copy a pen or brush when it is
+# set, so these are never modified after creation.
+KNOT_COLOR = QColor(0, 0, 255)
+CORNER_COLOR = QColor(255, 0, 0)
+AXIS_COLOR = QColor(0, 255, 0)
+IN_HANDLE_COLOR = QColor(255, 100, 100)   # Red for in handles
+OUT_HANDLE_COLOR = QColor(100, 200, 255)  # Blue for out handles
+
+CURVE_PEN = QPen(QColor(0, 128, 255), 2)
+IN_LINE_PEN = QPen(IN_HANDLE_COLOR, 1, Qt.DashLine)
+OUT_LINE_PEN = QPen(OUT_HANDLE_COLOR, 1, Qt.DashLine)
+
+# (pen, brush) of filled point markers by color
+_MARKER_STYLES = {}
+
+def _marker_style(color):
+    """
+    Shared pen and brush for point markers and handles of a color
+    
+    Args:
+        color: QColor of the marker
+        
+    Returns:
+        Tuple (pen, brush)
+    """
+    style = _MARKER_STYLES.get(color.rgba())
+    if style is None:
+        style = (QPen(color, 2), QBrush(color, Qt.SolidPattern))
+        _MARKER_STYLES[color.rgba()] = style
+    return style
+
+# Rendered point labels by (text, color)
+_LABEL_PIXMAPS = {}
+
+def _label_pixmap(text, color):
+    """
+    Shared pre-rendered pixmap of a point label
+    
+    Args:
+        text: Label text
+        color: QColor of the text
+        
+    Returns:
+        QPixmap with the text on a transparent background
+    """
+    key = (text, color.rgba())
+    pixmap = _LABEL_PIXMAPS.get(key)
+    if pixmap is None:
+        font = QFont()
+        size = QFontMetrics(font).size(0, text)
+        pixmap = QPixmap(size)
+        pixmap.fill(Qt.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(pixmap.rect(), Qt.AlignLeft | Qt.AlignTop, text)
+        painter.end()
+        
+        _LABEL_PIXMAPS[key] = pixmap
+    return pixmap
+
+def _array_to_qimage(image):
+    """
+    Wrap an image array in a QImage without copying the pixels
+    
+    Args:
+        image: C-contiguous array of shape (H, W) for grayscale or (H, W, 3)
+            / (H, W, 4) for RGB / RGBA, with 8-bit channels. It must stay
+            alive as long as the QImage is used.
+        
+    Returns:
+        QImage reading the array buffer
+    """
+    height, width = image.shape[:2]
+    bytes_per_line = image.strides[0]
+    
+    if len(image.shape) == 3 and image.shape[2] == 3:
+        # RGB image
+        return QImage(image.data, width, height, bytes_per_line, QImage.Format_RGB888)
+    elif len(image.shape) == 3 and image.shape[2] == 4:
+        # RGBA image
+        return QImage(image.data, width, height, bytes_per_line, QImage.Format_RGBA8888)
+    else:
+        # Grayscale image
+        return QImage(image.data, width, height, bytes_per_line, QImage.Format_Grayscale8)
+
+def _opengl_available():
+    """
+    Check whether an OpenGL context can be created on this platform
+    
+    Returns:
+        True if an OpenGL viewport can be used
+    """
+    return QOpenGLContext().create()
+
+def _array_to_qpath(points):
+    """
+    Build a polyline path from an array of points in one step
+    
+    Packs the points in the QDataStream format of QPainterPath and reads
+    the path back from it, instead of one lineTo call per point. Falls back
+    to lineTo calls if the stream cannot be read.
+    
+    Args:
+        points: Array of shape (N, 2) with the polyline vertices
+        
+    Returns:
+        QPainterPath through the points
+    """
+    points = np.asarray(points, dtype=float)
+    if not len(points):
+        return QPainterPath()
+    
+    # Element type (0 = MoveTo, 1 = LineTo) and coordinates of each vertex
+    elements = np.empty(len(points), dtype=[('type', '>i4'), ('x', '>f8'), ('y', '>f8')])
+    elements['type'] = 1
+    elements['type'][0] = 0
+    elements['x'] = points[:, 0]
+    elements['y'] = points[:, 1]
+    
+    # Element count, elements, start of the current subpath, fill rule
+    data = (np.array(len(points), dtype='>i4').tobytes() + elements.tobytes()
+            + np.array([0, Qt.OddEvenFill], dtype='>i4').tobytes())
+    
+    path = QPainterPath()
+    stream = QDataStream(QByteArray(data))
+    stream >> path
+    if stream.status() == QDataStream.Ok:
+        return path
+    
+    # Build the path point by point instead
+    path = QPainterPath()
+    path.moveTo(*points[0])
+    for x, y in points[1:]:
+        path.lineTo(x, y)
+    return path
+
 class TangentHandle(QGraphicsEllipseItem):
     """A draggable tangent handle"""
     
     def __init__(self, handle_type='out', size=8):
         # Store the size for later use
         self.handle_size = size
+        self._half = size * 0.5
         self.handle_type = handle_type  # 'in' or 'out'
         
         # Set color based on handle type
-        if handle_type == 'in':
-            color = QColor(255, 100, 100)  # Red for in handles
-        else:
-            color = QColor(100, 200, 255)  # Blue for out handles
+        pen, brush = _marker_style(IN_HANDLE_COLOR if handle_type == 'in' else OUT_HANDLE_COLOR)
         
-        # Create ellipse with size
-        super().__init__(0, 0, size, size)
-        self.setPen(QPen(color, 2))
-        self.setBrush(QBrush(color, Qt.SolidPattern))
+        # Create ellipse with size, centered on the item position
+        super().__init__(-self._half, -self._half, size, size)
+        self.setPen(pen)
+        self.setBrush(brush)
+        self.setFlag(self.ItemIgnoresTransformations, True)  # Same size at any zoom
         self.setFlag(self.ItemIsMovable, True)
         self.setFlag(self.ItemSendsGeometryChanges, True)
         self.setCursor(Qt.SizeAllCursor)
         self.setZValue(10)  # Above curve and knot points
         
+        # Reuse the rendered handle while panning instead of repainting it
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        
         self.knot = None
         self.tangent_line = None
         self.parent_view = None
@@ -43,19 +186,18 @@ class TangentHandle(QGraphicsEllipseItem):
     def get_center(self):
         """Get the center position of the handle in scene coordinates"""
         pos = self.scenePos()
-        return (pos.x() + self.handle_size/2, pos.y() + self.handle_size/2)
+        return (pos.x(), pos.y())
     
     def set_center(self, x, y):
         """Set the position so the center is at (x, y)"""
-        self.setPos(x - self.handle_size/2, y - self.handle_size/2)
+        self.setPos(x, y)
     
     def itemChange(self, change, value):
         """Handle item changes"""
         if change == self.ItemPositionChange and self.knot:
-            # Calculate the new center position
-            new_pos = value
-            center_x = new_pos.x() + self.handle_size / 2
-            center_y = new_pos.y() + self.handle_size / 2
+            # The position is the center of the handle
+            center_x = value.x()
+            center_y = value.y()
             
             # Update knot handle position
             self.knot.set_handle_position(self.handle_type, center_x, center_y)
@@ -74,6 +216,64 @@ class TangentHandle(QGraphicsEllipseItem):
         return super().itemChange(change, value)
 
 
+class _ImageSignals(QObject):
+    """Signals emitted by an image conversion task"""
+    
+    # (generation, QImage)
+    finished = pyqtSignal(int, object)
+
+
+class _ImageConversionTask(QRunnable):
+    """Background task converting an image array for display"""
+    
+    def __init__(self, image, generation, signals):
+        """
+        Initialize the task
+        
+        Args:
+            image: Image array (not modified)
+            generation: Image generation of the view when the task started
+            signals: _ImageSignals used to report the result
+        """
+        super().__init__()
+        self.image = image
+        self.generation = generation
+        self.signals = signals
+    
+    def run(self):
+        """Convert the image and hand it back to the GUI thread"""
+        image = np.ascontiguousarray(self.image)
+        qimage = _array_to_qimage(image)
+        
+        # Convert to the format pixmaps use natively. This copies the pixels
+        # out of the array and leaves little work for QPixmap.fromImage().
+        if qimage.hasAlphaChannel():
+            qimage = qimage.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        else:
+            qimage = qimage.convertToFormat(QImage.Format_RGB32)
+
+        try:
+            self.signals.finished.emit(self.generation, qimage)
+        except RuntimeError:
+            # The view was deleted while the task was running
+            pass
+
+
+class ItemLayer(QGraphicsItem):
+    """Invisible parent item, so its children can be removed in one call"""
+    
+    def __init__(self):
+        super().__init__()
+        self.setFlag(self.ItemHasNoContents, True)
+    
+    def boundingRect(self):
+        """The layer itself has no extent"""
+        return QRectF()
+    
+    def paint(self, painter, option, widget=None):
+        """Nothing to draw, the children paint themselves"""
+
+
 class ImageView(QGraphicsView):
     """Enhanced widget for displaying and interacting with the plot image"""
     
@@ -81,17 +281,31 @@ class ImageView(QGraphicsView):
     corner_points_changed = pyqtSignal(object)
     axis_points_changed = pyqtSignal(str, object)
     
+    # Number of samples used to draw the curve path
+    curve_samples = 200
+    
+    # Use an OpenGL viewport when the platform supports it
+    use_opengl = True
+    
     def __init__(self, parent=None):
         """Initialize the image view"""
         super().__init__(parent)
         
-        # Create scene
+        # Create scene. It holds few items that move a lot, so skip the BSP
+        # index, which would be updated on every move
         self.scene = QGraphicsScene(self)
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(self.scene)
         
         # Image item
         self.image_item = None
         
+        # Image arrays are converted in the background; results for an
+        # image that was replaced meanwhile are dropped
+        self._image_generation = 0
+        self._image_signals = _ImageSignals(self)
+        self._image_signals.finished.connect(self._on_image_ready)
+        
         # Corner points for perspective correction
         self.corner_points = []
         self.corner_markers = []
@@ -103,13 +317,38 @@ class ImageView(QGraphicsView):
         self.y_axis_markers = []
         
         # Curve points, markers, and tangent handles
-        self.curve_points = []
+        self.curve_points = np.empty((0, 2), dtype=np.float32)  # Knot positions
         self.curve_markers = []
         self.curve_path = None
+        self.curve_layer = None    # Parent item of all curve graphics
         self.tangent_handles = []  # List of TangentHandle objects
         self.tangent_lines = []    # Lines connecting handles to knots
+        self.knot_handles = []     # Tangent handles of each knot, by row
         self.current_curve = None  # Reference to current NurbsCurve
         
+        # Reused for every curve path update; the samples are copied into the
+        # path right away
+        self._sample_buffer = np.empty((self.curve_samples, 2))
+        
+        # Coalesces curve updates from tangent handle drags
+        self._handle_timer = QTimer(self)
+        self._handle_timer.setSingleShot(True)
+        self._handle_timer.setInterval(16)
+        self._handle_timer.timeout.connect(self._do_update_curve_from_handles)
+        
+        # Coalesces curve updates from knot drags
+        self._resample_timer = QTimer(self)
+        self._resample_timer.setSingleShot(True)
+        self._resample_timer.setInterval(16)
+        self._resample_timer.timeout.connect(self._do_resample)
+        
+        # Wheel zoom collected since the last applied scale
+        self._pending_zoom = 1.0
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(16)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
+        
         # Interaction state
         self.mode = "view"  # "view", "mark_corners", "mark_x_axis", "mark_y_axis", "edit_curve"
         self.current_point_index = -1
@@ -122,11 +361,25 @@ class ImageView(QGraphicsView):
         self.setResizeAnchor(self.AnchorUnderMouse)
         self.setMinimumSize(400, 300)
         
+        # All items are stock Qt items that set their own pen and brush
+        self.setOptimizationFlag(self.DontSavePainterState, True)
+        
+        # Paint through OpenGL when possible, GL viewports redraw fully
+        if self.use_opengl and _opengl_available():
+            viewport = QOpenGLWidget()
+            surface_format = QSurfaceFormat()
+            surface_format.setSamples(4)
+            viewport.setFormat(surface_format)
+            self.setViewport(viewport)
+            self.setViewportUpdateMode(self.FullViewportUpdate)
+        
         # Connect signals
         self.setMouseTracking(True)
     
     def set_image(self, image):
         """Set the image to display"""
+        self._image_generation += 1
+        
         # Clear scene
         self.scene.clear()
         self.image_item = None
@@ -135,39 +388,43 @@ class ImageView(QGraphicsView):
         self.y_axis_markers = []
         self.curve_markers = []
         self.curve_path = None
+        self.curve_layer = None
         self.tangent_handles = []
         self.tangent_lines = []
+        self.knot_handles = []
         
         if image is None:
             return
         
-        # Convert numpy array to QImage
         if isinstance(image, np.ndarray):
+            # Show an empty item of the final size until the pixels are
+            # converted off the GUI thread
             height, width = image.shape[:2]
+            self.image_item = QGraphicsPixmapItem()
+            self.scene.setSceneRect(0, 0, width, height)
             
-            if len(image.shape) == 3 and image.shape[2] == 3:
-                # RGB image
-                qimage = QImage(image.data, width, height, width * 3, QImage.Format_RGB888)
-            elif len(image.shape) == 3 and image.shape[2] == 4:
-                # RGBA image
-                qimage = QImage(image.data, width, height, width * 4, QImage.Format_RGBA8888)
-            else:
-                # Grayscale image
-                qimage = QImage(image.data, width, height, width, QImage.Format_Grayscale8)
+            task = _ImageConversionTask(image, self._image_generation, self._image_signals)
+            QThreadPool.globalInstance().start(task)
         else:
-            qimage = QImage(image)
-        
-        # Create pixmap and add to scene
-        pixmap = QPixmap.fromImage(qimage)
-        self.image_item = QGraphicsPixmapItem(pixmap)
+            pixmap = QPixmap.fromImage(QImage(image))
+            self.image_item = QGraphicsPixmapItem(pixmap)
+            self.scene.setSceneRect(self.image_item.boundingRect())
         self.scene.addItem(self.image_item)
         
-        # Set scene rect to match the image
-        self.scene.setSceneRect(self.image_item.boundingRect())
-        
         # Reset view
         self.zoom_to_fit()
     
+    def _on_image_ready(self, generation, qimage):
+        """
+        Show an image converted in the background
+        
+        Args:
+            generation: Image generation the conversion was started for
+            qimage: Converted QImage
+        """
+        if generation == self._image_generation and self.image_item is not None:
+            self.image_item.setPixmap(QPixmap.fromImage(qimage))
+    
     def set_corner_points(self, points):
         """Set the corner points for perspective correction"""
         # Clear existing markers
@@ -183,14 +440,13 @@ class ImageView(QGraphicsView):
         # Update corner points
         self.corner_points = points.tolist() if isinstance(points, np.ndarray) else points
         
-        # Create markers
+        # Create markers under one layer and add them to the scene together
+        layer = ItemLayer()
         for i, point in enumerate(self.corner_points):
-            marker = self.create_point_marker(point[0], point[1], QColor(255, 0, 0))
-            label = self.scene.addText(str(i+1))
-            label.setPos(point[0], point[1])
-            label.setDefaultTextColor(QColor(255, 0, 0))
-            self.corner_markers.append(marker)
-            self.corner_markers.append(label)
+            self.create_point_marker(point[0], point[1], CORNER_COLOR, parent=layer)
+            self.create_label(point[0], point[1], str(i+1), CORNER_COLOR, parent=layer)
+        self.scene.addItem(layer)
+        self.corner_markers.append(layer)
         
         # Emit signal
         self.corner_points_changed.emit(np.array(self.corner_points))
@@ -237,15 +493,22 @@ class ImageView(QGraphicsView):
         self._clear_curve_graphics()
         
         # Extract knot points from the curve
-        self.curve_points = [(knot.x, knot.y) for knot in curve.knots]
+        self.curve_points = np.array([(knot.x, knot.y) for knot in curve.knots],
+                                     dtype=np.float32).reshape(-1, 2)
         
         # Create markers for knot points and tangent handles
         for i, knot in enumerate(curve.knots):
             # Create knot marker
-            marker = self.create_point_marker(knot.x, knot.y, QColor(0, 0, 255))
+            marker = self.create_point_marker(knot.x, knot.y, KNOT_COLOR,
+                                              parent=self._get_curve_layer())
             marker.setZValue(5)  # Above curve but below handles
             self.curve_markers.append(marker)
             
+            # Handles of this knot, so a drag only touches its own handles
+            # and lines
+            handles = []
+            self.knot_handles.append(handles)
+            
             # Create tangent handles if knot has manual tangent
             if knot.tangent_angle is not None:
                 # Always create out handle
@@ -256,15 +519,16 @@ class ImageView(QGraphicsView):
                 
                 # Out tangent line
                 out_line = QGraphicsLineItem(knot.x, knot.y, knot.out_handle_x, knot.out_handle_y)
-                out_line.setPen(QPen(QColor(100, 200, 255), 1, Qt.DashLine))
+                out_line.setPen(OUT_LINE_PEN)
                 out_line.setZValue(1)
                 
                 # Store reference
                 out_handle.tangent_line = out_line
+                handles.append(out_handle)
                 
                 # Add to scene
-                self.scene.addItem(out_line)
-                self.scene.addItem(out_handle)
+                out_line.setParentItem(self.curve_layer)
+                out_handle.setParentItem(self.curve_layer)
                 
                 self.tangent_handles.append(out_handle)
                 self.tangent_lines.append(out_line)
@@ -278,15 +542,16 @@ class ImageView(QGraphicsView):
                     
                     # In tangent line
                     in_line = QGraphicsLineItem(knot.in_handle_x, knot.in_handle_y, knot.x, knot.y)
-                    in_line.setPen(QPen(QColor(255, 100, 100), 1, Qt.DashLine))
+                    in_line.setPen(IN_LINE_PEN)
                     in_line.setZValue(1)
                     
                     # Store reference
                     in_handle.tangent_line = in_line
+                    handles.append(in_handle)
                     
                     # Add to scene
-                    self.scene.addItem(in_line)
-                    self.scene.addItem(in_handle)
+                    in_line.setParentItem(self.curve_layer)
+                    in_handle.setParentItem(self.curve_layer)
                     
                     self.tangent_handles.append(in_handle)
                     self.tangent_lines.append(in_line)
@@ -294,26 +559,85 @@ class ImageView(QGraphicsView):
         # Draw the curve path
         self.update_curve_path(curve)
     
+    def refresh_selected_handles(self, index):
+        """
+        Move the marker and tangent handles of one knot to match its
+        current position and tangent
+        
+        Falls back to rebuilding all curve graphics when the knot needs a
+        different set of handles than it has (e.g. manual tangent toggled).
+        
+        Args:
+            index: Index of the knot in the current curve
+        """
+        if self.current_curve is None or not 0 <= index < len(self.current_curve.knots):
+            return
+        
+        knot = self.current_curve.knots[index]
+        handles = self.knot_handles[index] if index < len(self.knot_handles) else []
+        
+        if knot.tangent_angle is None:
+            expected = 0
+        else:
+            expected = 2 if knot.independent_handles else 1
+        if len(handles) != expected:
+            self.start_editing_curve(self.current_curve)
+            return
+        
+        self.curve_points[index] = (knot.x, knot.y)
+        if index < len(self.curve_markers):
+            marker = self.curve_markers[index]
+            marker.setPos(knot.x, knot.y)
+        
+        for handle in handles:
+            if handle.handle_type == 'in':
+                x, y = knot.in_handle_x, knot.in_handle_y
+            else:
+                x, y = knot.out_handle_x, knot.out_handle_y
+            
+            # Detach the knot while moving so itemChange does not write the
+            # position back into it
+            handle.knot = None
+            handle.set_center(x, y)
+            handle.knot = knot
+            
+            if handle.tangent_line:
+                if handle.handle_type == 'in':
+                    handle.tangent_line.setLine(x, y, knot.x, knot.y)
+                else:
+                    handle.tangent_line.setLine(knot.x, knot.y, x, y)
+    
+    def _get_curve_layer(self):
+        """Parent item for curve graphics, created on first use"""
+        if self.curve_layer is None:
+            self.curve_layer = ItemLayer()
+            self.curve_layer.setZValue(1)  # Above the image
+            self.scene.addItem(self.curve_layer)
+        return self.curve_layer
+    
     def _clear_curve_graphics(self):
         """Clear all curve-related graphics"""
-        for marker in self.curve_markers:
-            self.scene.removeItem(marker)
-        self.curve_markers = []
+        # Removing the layer takes all markers, handles, lines and the path
+        # out of the scene at once
+        if self.curve_layer is not None:
+            self.scene.removeItem(self.curve_layer)
+            self.curve_layer = None
         
-        for handle in self.tangent_handles:
-            self.scene.removeItem(handle)
+        self.curve_markers = []
         self.tangent_handles = []
-        
-        for line in self.tangent_lines:
-            self.scene.removeItem(line)
         self.tangent_lines = []
-        
-        if self.curve_path is not None:
-            self.scene.removeItem(self.curve_path)
-            self.curve_path = None
+        self.knot_handles = []
+        self.curve_path = None
     
     def update_curve_from_handles(self):
         """Update curve when tangent handles are moved"""
+        # Handles report every position change; redraw at most once per
+        # frame while one is dragged
+        if not self._handle_timer.isActive():
+            self._handle_timer.start()
+    
+    def _do_update_curve_from_handles(self):
+        """Redraw the curve after tangent handles were moved"""
         if self.current_curve and not self.dragging_knot:
             self.current_curve.update_curve()
             self.update_curve_path(self.current_curve)
@@ -322,38 +646,73 @@ class ImageView(QGraphicsView):
             if hasattr(self.parent(), 'curve_editor'):
                 self.parent().curve_editor.update_properties_ui()
     
+    def _do_resample(self):
+        """Redraw the curve after a knot was dragged"""
+        if self.current_curve:
+            self.current_curve.update_curve()
+            self.update_curve_path(self.current_curve)
+    
     def update_curve_path(self, curve):
         """Update the curve path display"""
-        if self.curve_path is not None:
-            self.scene.removeItem(self.curve_path)
-        
         # Sample the curve
-        points = curve.sample(200)
-        if points is None or len(points) < 2:
-            self.curve_path = None
-            return
+        self.set_curve_polyline(curve.sample(self.curve_samples, self._sample_buffer))
+    
+    def set_curve_polyline(self, points):
+        """
+        Display an already sampled curve
         
+        Args:
+            points: Array of (x, y) curve samples
+        """
         # Create a path
-        path = QPainterPath()
-        path.moveTo(points[0][0], points[0][1])
-        
-        for i in range(1, len(points)):
-            path.lineTo(points[i][0], points[i][1])
-        
-        # Create path item
-        self.curve_path = QGraphicsPathItem(path)
-        self.curve_path.setPen(QPen(QColor(0, 128, 255), 2))
-        self.curve_path.setZValue(2)  # Above image but below knots
-        self.scene.addItem(self.curve_path)
-    
-    def create_point_marker(self, x, y, color, size=8):
-        """Create a marker for a point"""
-        marker = QGraphicsEllipseItem(x - size/2, y - size/2, size, size)
-        marker.setPen(QPen(color, 2))
-        marker.setBrush(QBrush(color, Qt.SolidPattern))
-        self.scene.addItem(marker)
+        if points is None or len(points) < 2:
+            path = QPainterPath()
+        else:
+            path = _array_to_qpath(points)
+        
+        # The path item is created once and then only gets new paths, so the
+        # scene does not have to remove and re-index it on every update
+        if self.curve_path is None:
+            self.curve_path = QGraphicsPathItem()
+            self.curve_path.setPen(CURVE_PEN)
+            self.curve_path.setZValue(2)  # Above tangent lines but below knots
+            self.curve_path.setParentItem(self._get_curve_layer())
+        
+        self.curve_path.setPath(path)
+    
+    def create_point_marker(self, x, y, color, size=8, parent=None):
+        """
+        Create a marker for a point, in the scene or under a parent item
+        
+        The marker is centered on its position and keeps its size in view
+        pixels at any zoom.
+        """
+        half = size * 0.5
+        marker = QGraphicsEllipseItem(-half, -half, size, size)
+        marker.setPos(x, y)
+        pen, brush = _marker_style(color)
+        marker.setPen(pen)
+        marker.setBrush(brush)
+        marker.setFlag(QGraphicsItem.ItemIgnoresTransformations, True)
+        marker.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        if parent is not None:
+            marker.setParentItem(parent)
+        else:
+            self.scene.addItem(marker)
         return marker
     
+    def create_label(self, x, y, text, color, parent=None):
+        """Create a label for a point from a shared pre-rendered pixmap"""
+        label = QGraphicsPixmapItem(_label_pixmap(text, color))
+        label.setPos(x, y)
+        label.setFlag(QGraphicsItem.ItemIgnoresTransformations, True)
+        label.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+        if parent is not None:
+            label.setParentItem(parent)
+        else:
+            self.scene.addItem(label)
+        return label
+    
     def mousePressEvent(self, event):
         """Handle mouse press events"""
         if self.image_item is None:
@@ -374,12 +733,14 @@ class ImageView(QGraphicsView):
             self._handle_y_axis_marking(x, y)
         
         elif self.mode == "edit_curve":
-            # Check if clicking on an existing knot point
-            for i, point in enumerate(self.curve_points):
-                if abs(x - point[0]) < 10 and abs(y - point[1]) < 10:
-                    self.current_point_index = i
-                    self.dragging_knot = True
-                    return
+            # Check if clicking on an existing knot point, within 10 view
+            # pixels as the markers do not scale; the lowest knot index wins
+            tolerance = 10 / self.transform().m11()
+            hits = np.flatnonzero((np.abs(self.curve_points - (x, y)) < tolerance).all(axis=1))
+            if len(hits):
+                self.current_point_index = int(hits[0])
+                self.dragging_knot = True
+                return
             
             # Not clicking on an existing point, add a new one
             if self.current_curve:
@@ -400,10 +761,8 @@ class ImageView(QGraphicsView):
         """Handle corner point marking"""
         if len(self.corner_points) < 4:
             self.corner_points.append([x, y])
-            marker = self.create_point_marker(x, y, QColor(255, 0, 0))
-            label = self.scene.addText(str(len(self.corner_points)))
-            label.setPos(x, y)
-            label.setDefaultTextColor(QColor(255, 0, 0))
+            marker = self.create_point_marker(x, y, CORNER_COLOR)
+            label = self.create_label(x, y, str(len(self.corner_points)), CORNER_COLOR)
             self.corner_markers.append(marker)
             self.corner_markers.append(label)
             
@@ -417,10 +776,8 @@ class ImageView(QGraphicsView):
         """Handle X-axis point marking"""
         if len(self.x_axis_points) < 2:
             self.x_axis_points.append([x, y])
-            marker = self.create_point_marker(x, y, QColor(0, 255, 0))
-            label = self.scene.addText("X" + str(len(self.x_axis_points)))
-            label.setPos(x, y)
-            label.setDefaultTextColor(QColor(0, 255, 0))
+            marker = self.create_point_marker(x, y, AXIS_COLOR)
+            label = self.create_label(x, y, "X" + str(len(self.x_axis_points)), AXIS_COLOR)
             self.x_axis_markers.append(marker)
             self.x_axis_markers.append(label)
             
@@ -443,10 +800,8 @@ class ImageView(QGraphicsView):
         """Handle Y-axis point marking"""
         if len(self.y_axis_points) < 2:
             self.y_axis_points.append([x, y])
-            marker = self.create_point_marker(x, y, QColor(0, 255, 0))
-            label = self.scene.addText("Y" + str(len(self.y_axis_points)))
-            label.setPos(x, y)
-            label.setDefaultTextColor(QColor(0, 255, 0))
+            marker = self.create_point_marker(x, y, AXIS_COLOR)
+            label = self.create_label(x, y, "Y" + str(len(self.y_axis_points)), AXIS_COLOR)
             self.y_axis_markers.append(marker)
             self.y_axis_markers.append(label)
             
@@ -487,62 +842,59 @@ class ImageView(QGraphicsView):
             if self.current_curve and self.current_point_index < len(self.current_curve.knots):
                 knot = self.current_curve.knots[self.current_point_index]
                 
-                # Calculate movement delta
-                old_x, old_y = knot.x, knot.y
-                dx = x - old_x
-                dy = y - old_y
-                
                 # Update knot position
                 knot.set_position(x, y)
+                self.curve_points[self.current_point_index] = (x, y)
                 
                 # Update the visual position of the knot marker
                 if self.current_point_index < len(self.curve_markers):
                     marker = self.curve_markers[self.current_point_index]
-                    marker_size = marker.rect().width()
-                    marker.setPos(x - marker_size/2, y - marker_size/2)
+                    marker.setPos(x, y)
                 
-                # Update tangent handles if they exist for this knot
-                if knot.tangent_angle is not None:
-                    # Find the handles for this knot
-                    for handle in self.tangent_handles:
-                        if handle.knot == knot:
-                            if handle.handle_type == 'in':
-                                handle.set_center(knot.in_handle_x, knot.in_handle_y)
-                            else:
-                                handle.set_center(knot.out_handle_x, knot.out_handle_y)
-                    
-                    # Update tangent lines
-                    for i, line in enumerate(self.tangent_lines):
-                        line_data = line.line()
-                        # Check if this line is connected to the moved knot
-                        if (abs(line_data.x1() - old_x) < 1 and abs(line_data.y1() - old_y) < 1):
-                            # This is an outgoing line
-                            line.setLine(x, y, line_data.x2() + dx, line_data.y2() + dy)
-                        elif (abs(line_data.x2() - old_x) < 1 and abs(line_data.y2() - old_y) < 1):
-                            # This is an incoming line
-                            line.setLine(line_data.x1() + dx, line_data.y1() + dy, x, y)
-                
-                # Update curve path
-                self.current_curve.update_curve()
-                self.update_curve_path(self.current_curve)
+                # Move the handles of this knot and their tangent lines
+                if self.current_point_index < len(self.knot_handles):
+                    handles = self.knot_handles[self.current_point_index]
+                else:
+                    handles = []
+                for handle in handles:
+                    if handle.handle_type == 'in':
+                        hx, hy = knot.in_handle_x, knot.in_handle_y
+                        line = (hx, hy, x, y)
+                    else:
+                        hx, hy = knot.out_handle_x, knot.out_handle_y
+                        line = (x, y, hx, hy)
+                    handle.set_center(hx, hy)
+                    handle.tangent_line.setLine(*line)
                 
-                # Update curve editor UI
-                self.parent().curve_editor.update_knot_list()
+                # Redraw the curve at most once per frame
+                if not self._resample_timer.isActive():
+                    self._resample_timer.start()
         else:
             super().mouseMoveEvent(event)
     
     def mouseReleaseEvent(self, event):
         """Handle mouse release events"""
+        # Update curve editor UI once the knot drag is finished
+        if self.dragging_knot:
+            self.parent().curve_editor.update_knot_list()
+        
         self.current_point_index = -1
         self.dragging_knot = False
         super().mouseReleaseEvent(event)
     
     def wheelEvent(self, event):
         """Handle mouse wheel events for zooming"""
-        if event.angleDelta().y() > 0:
-            self.zoom_in()
-        else:
-            self.zoom_out()
+        # One wheel step (120) zooms by 1.2; finer trackpad events zoom by
+        # a fraction of that, applied at most once per frame
+        self._pending_zoom *= 1.2 ** (event.angleDelta().y() / 120)
+        if not self._zoom_timer.isActive():
+            self._zoom_timer.start()
+    
+    def _apply_pending_zoom(self):
+        """Apply the wheel zoom collected since the last frame"""
+        factor = self._pending_zoom
+        self._pending_zoom = 1.0
+        self.scale(factor, factor)
     
     def zoom_in(self):
         """Zoom in"""
@@ -560,8 +912,9 @@ class ImageView(QGraphicsView):
         # Reset transformation
         self.resetTransform()
         
-        # Get the image and view rects
-        image_rect = self.image_item.boundingRect()
+        # Get the image and view rects. The scene rect has the image size
+        # even while the pixels are still being converted.
+        image_rect = self.scene.sceneRect()
         view_rect = self.viewport().rect()
         
         # Calculate the scaling factors
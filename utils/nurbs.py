@@ -4,12 +4,35 @@
 Enhanced NURBS curves implementation with proper tangent support
 """
 
+import heapq
+import math
 import numpy as np
 from scipy import interpolate
 
+# Marker for attributes that have not been set yet
+_MISSING = object()
+
+# Knot fields that shape the curve, with their row in the knot arrays of
+# the owning curve
+_KNOT_FIELDS = {'x': 0, 'y': 1, 'tension': 2, 'tangent_angle': 3,
+                'tangent_magnitude_in': 4, 'tangent_magnitude_out': 5,
+                'tangent_angle_in': 6, 'independent_handles': 7}
+
+# Maps the Hermite data (p0, t0, p1, t1) of a span to the power basis
+# coefficients (a, b, c, d) of a*t^3 + b*t^2 + c*t + d
+_HERMITE_TO_POWER = np.array([[2.0, 1.0, -2.0, 1.0],
+                              [-3.0, -2.0, 3.0, -1.0],
+                              [0.0, 1.0, 0.0, 0.0],
+                              [1.0, 0.0, 0.0, 0.0]])
+
 class NurbsKnot:
     """Class to represent a knot in a NURBS curve"""
     
+    # Curve owning this knot (set by NurbsCurve) and the knot's column in
+    # the curve's knot arrays (set when the arrays are built)
+    _curve = None
+    _row = None
+    
     def __init__(self, x, y, tension=0.5, tangent_angle=None):
         """
         Initialize a NURBS knot
@@ -44,6 +67,21 @@ class NurbsKnot:
         # Update handle positions
         self._update_handles()
     
+    def __setattr__(self, name, value):
+        """Set an attribute and let the owning curve know when a curve field changed"""
+        field = _KNOT_FIELDS.get(name)
+        if field is None:
+            # Handle positions and other derived state do not shape the curve
+            object.__setattr__(self, name, value)
+            return
+        
+        old = self.__dict__.get(name, _MISSING)
+        object.__setattr__(self, name, value)
+        
+        curve = self._curve
+        if curve is not None and (old is _MISSING or old != value):
+            curve._knot_changed(self, field, value)
+    
     @property
     def tangent_magnitude(self):
         """Compatibility property for code expecting single magnitude"""
@@ -121,16 +159,16 @@ class NurbsKnot:
             # Calculate angle and magnitude from handle position
             dx = x - self.x
             dy = y - self.y
-            self.tangent_magnitude_in = np.sqrt(dx**2 + dy**2)
+            self.tangent_magnitude_in = math.sqrt(dx**2 + dy**2)
             
             if self.tangent_magnitude_in > 0:
                 if self.independent_handles:
                     # Store angle from knot to in handle
-                    self.tangent_angle_in = np.arctan2(dy, dx)
+                    self.tangent_angle_in = math.atan2(dy, dx)
                 else:
                     # In colinear mode, adjusting in handle updates the main angle
                     # The out handle should point opposite to the in handle
-                    self.tangent_angle = np.arctan2(-dy, -dx)
+                    self.tangent_angle = math.atan2(-dy, -dx)
                     # Update out handle position to maintain colinearity
                     self._update_out_handle()
                     
@@ -140,11 +178,11 @@ class NurbsKnot:
             # Calculate angle and magnitude from handle position
             dx = x - self.x
             dy = y - self.y
-            self.tangent_magnitude_out = np.sqrt(dx**2 + dy**2)
+            self.tangent_magnitude_out = math.sqrt(dx**2 + dy**2)
             
             if self.tangent_magnitude_out > 0:
                 # Out handle angle (from knot to handle)
-                self.tangent_angle = np.arctan2(dy, dx)
+                self.tangent_angle = math.atan2(dy, dx)
                 
                 if not self.independent_handles:
                     # Update in handle position to maintain colinearity
@@ -158,16 +196,16 @@ class NurbsKnot:
             effective_mag_in = self.tangent_magnitude_in * (1.0 - self.tension * 0.8)
             
             # Out handle uses the main tangent angle
-            dx_out = effective_mag_out * np.cos(self.tangent_angle)
-            dy_out = effective_mag_out * np.sin(self.tangent_angle)
+            dx_out = effective_mag_out * math.cos(self.tangent_angle)
+            dy_out = effective_mag_out * math.sin(self.tangent_angle)
             self.out_handle_x = self.x + dx_out
             self.out_handle_y = self.y + dy_out
             
             # In handle calculation
             if self.independent_handles and self.tangent_angle_in is not None:
                 # Use independent angle for in handle (angle from knot to handle)
-                dx_in = effective_mag_in * np.cos(self.tangent_angle_in)
-                dy_in = effective_mag_in * np.sin(self.tangent_angle_in)
+                dx_in = effective_mag_in * math.cos(self.tangent_angle_in)
+                dy_in = effective_mag_in * math.sin(self.tangent_angle_in)
                 self.in_handle_x = self.x + dx_in
                 self.in_handle_y = self.y + dy_in
             else:
@@ -180,8 +218,8 @@ class NurbsKnot:
         if self.tangent_angle is not None:
             effective_mag_in = self.tangent_magnitude_in * (1.0 - self.tension * 0.8)
             # In handle points in opposite direction
-            dx = effective_mag_in * np.cos(self.tangent_angle + np.pi)
-            dy = effective_mag_in * np.sin(self.tangent_angle + np.pi)
+            dx = effective_mag_in * math.cos(self.tangent_angle + math.pi)
+            dy = effective_mag_in * math.sin(self.tangent_angle + math.pi)
             self.in_handle_x = self.x + dx
             self.in_handle_y = self.y + dy
     
@@ -190,8 +228,8 @@ class NurbsKnot:
         if self.tangent_angle is not None:
             effective_mag_out = self.tangent_magnitude_out * (1.0 - self.tension * 0.8)
             # Out handle uses the main tangent angle
-            dx = effective_mag_out * np.cos(self.tangent_angle)
-            dy = effective_mag_out * np.sin(self.tangent_angle)
+            dx = effective_mag_out * math.cos(self.tangent_angle)
+            dy = effective_mag_out * math.sin(self.tangent_angle)
             self.out_handle_x = self.x + dx
             self.out_handle_y = self.y + dy
     
@@ -216,20 +254,20 @@ class NurbsKnot:
                 # Use independent in angle
                 # The in handle points at angle tangent_angle_in from the knot
                 # The tangent vector should point from the in handle towards the knot
-                dx = effective_magnitude * np.cos(self.tangent_angle_in + np.pi)
-                dy = effective_magnitude * np.sin(self.tangent_angle_in + np.pi)
+                dx = effective_magnitude * math.cos(self.tangent_angle_in + math.pi)
+                dy = effective_magnitude * math.sin(self.tangent_angle_in + math.pi)
                 return (dx, dy)
             else:
                 # Colinear mode: in tangent should have same direction as out tangent
                 # This ensures smooth continuity through the knot
-                dx = effective_magnitude * np.cos(self.tangent_angle)
-                dy = effective_magnitude * np.sin(self.tangent_angle)
+                dx = effective_magnitude * math.cos(self.tangent_angle)
+                dy = effective_magnitude * math.sin(self.tangent_angle)
                 return (dx, dy)
         else:
             # Out tangent
             effective_magnitude = self.tangent_magnitude_out * (1.0 - self.tension * 0.8)
-            dx = effective_magnitude * np.cos(self.tangent_angle)
-            dy = effective_magnitude * np.sin(self.tangent_angle)
+            dx = effective_magnitude * math.cos(self.tangent_angle)
+            dy = effective_magnitude * math.sin(self.tangent_angle)
             return (dx, dy)
     
     def to_dict(self):
@@ -256,22 +294,151 @@ class NurbsCurve:
     def __init__(self):
         """Initialize an empty NURBS curve"""
         self.knots = []
-        self._hermite_segments = []
         self._update_needed = True
+        
+        # Segment control data as an (n_segments, 4, 2) array of p0, t0, p1, t1
+        self._segment_array = np.empty((0, 4, 2))
+        
+        # Power basis coefficients per span, (n_segments, 4, 2) array of a, b, c, d
+        self._span_coeffs = np.empty((0, 4, 2))
+        
+        # Sampling basis tables keyed by (n_segments, num_points)
+        self._basis_cache = {}
+        
+        # Per-field arrays mirroring the knots, rebuilt on demand
+        self._knot_arrays = None
+    
+    def _invalidate(self):
+        """Mark the segments and knot arrays as out of date"""
+        self._update_needed = True
+        self._knot_arrays = None
+    
+    def _knot_changed(self, knot, field, value):
+        """
+        Update the knot arrays after a field of one knot changed
+        
+        Args:
+            knot: NurbsKnot that changed
+            field: Row of the field in the knot arrays
+            value: New value of the field
+        """
+        self._update_needed = True
+        
+        arrays = self._knot_arrays
+        if arrays is None:
+            return
+        
+        row = knot._row
+        if row is not None and row < len(self.knots) and self.knots[row] is knot:
+            arrays[field, row] = np.nan if value is None else value
+        else:
+            # The knot list changed without add_knot/remove_knot
+            self._knot_arrays = None
+    
+    def _get_knot_arrays(self):
+        """
+        Get the knot fields as a structure of arrays
+        
+        The arrays are built in one pass over the knots and then kept up to
+        date one element at a time as knot fields change.
+        
+        Returns:
+            Read-only array of shape (8, N) with rows x, y, tension,
+            tangent angle (NaN for auto), in magnitude, out magnitude,
+            in angle (NaN if unset) and independent handles flag (0 or 1)
+        """
+        if self._knot_arrays is None:
+            rows = []
+            for row, k in enumerate(self.knots):
+                k._row = row
+                rows.append((k.x, k.y, k.tension,
+                             np.nan if k.tangent_angle is None else k.tangent_angle,
+                             k.tangent_magnitude_in, k.tangent_magnitude_out,
+                             np.nan if k.tangent_angle_in is None else k.tangent_angle_in,
+                             k.independent_handles))
+            self._knot_arrays = np.array(rows, dtype=float).reshape(-1, 8).T.copy()
+        
+        arrays = self._knot_arrays.view()
+        arrays.setflags(write=False)
+        return arrays
     
     @property
-    def bspline(self):
-        """Compatibility property for code expecting bspline attribute"""
-        # Return non-None if we have a valid curve
-        if len(self.knots) >= 2 and self._hermite_segments:
-            return True  # Just indicate we have a valid curve
-        return None
+    def xs(self):
+        """Knot x-coordinates"""
+        return self._get_knot_arrays()[0]
+    
+    @property
+    def ys(self):
+        """Knot y-coordinates"""
+        return self._get_knot_arrays()[1]
+    
+    @property
+    def tensions(self):
+        """Knot tensions"""
+        return self._get_knot_arrays()[2]
+    
+    @property
+    def angles(self):
+        """Knot tangent angles in radians (NaN for auto tangents)"""
+        return self._get_knot_arrays()[3]
+    
+    @property
+    def mags_in(self):
+        """Knot in handle magnitudes"""
+        return self._get_knot_arrays()[4]
+    
+    @property
+    def mags_out(self):
+        """Knot out handle magnitudes"""
+        return self._get_knot_arrays()[5]
+    
+    @property
+    def angles_in(self):
+        """Knot in handle angles in radians (NaN if not set)"""
+        return self._get_knot_arrays()[6]
+    
+    @property
+    def independent(self):
+        """Boolean mask of knots with independent handles"""
+        return self._get_knot_arrays()[7] != 0
+    
+    @property
+    def manual_tangent(self):
+        """Boolean mask of knots with a tangent angle set"""
+        return ~np.isnan(self.angles)
+    
+    def _tangent_vectors(self):
+        """
+        Get the in and out tangent vectors of all knots
+        
+        Vectorized form of NurbsKnot.get_tangent_vector.
+        
+        Returns:
+            Tuple (t_in, t_out) of arrays with shape (N, 2)
+        """
+        arrays = self._get_knot_arrays()
+        tension, angle, mag_in, mag_out, angle_in = arrays[2:7]
+        
+        # Apply tension to magnitudes
+        scale = 1.0 - tension * 0.8
+        t_out = np.column_stack((np.cos(angle), np.sin(angle))) * (mag_out * scale)[:, None]
+        
+        # In tangent follows the out direction unless the in handle is independent
+        in_dir = np.where(self.independent & ~np.isnan(angle_in), angle_in + np.pi, angle)
+        t_in = np.column_stack((np.cos(in_dir), np.sin(in_dir))) * (mag_in * scale)[:, None]
+        
+        # Knots without a tangent angle contribute no tangent
+        auto = np.isnan(angle)
+        t_out[auto] = 0.0
+        t_in[auto] = 0.0
+        
+        return t_in, t_out
     
     @property
     def bspline(self):
         """Compatibility property for code expecting bspline attribute"""
         # Return non-None if we have a valid curve
-        if len(self.knots) >= 2 and self._hermite_segments:
+        if len(self.knots) >= 2 and len(self._segment_array):
             return True  # Just indicate we have a valid curve
         return None
     
@@ -301,13 +468,24 @@ class NurbsCurve:
                 if knot.x < k.x:
                     self.knots.insert(i, knot)
                     break
-        self._update_needed = True
+        knot._curve = self
+        self._invalidate()
     
     def remove_knot(self, index):
         """Remove a knot from the curve"""
         if 0 <= index < len(self.knots):
+            self.knots[index]._curve = None
             del self.knots[index]
-            self._update_needed = True
+            self._invalidate()
+    
+    def knots_xy(self):
+        """
+        Get the knot positions
+        
+        Returns:
+            Array of shape (N, 2) with the (x, y) position of each knot
+        """
+        return self._get_knot_arrays()[:2].T
     
     def _calculate_auto_tangents(self):
         """Calculate automatic tangents for knots that don't have manual ones"""
@@ -333,16 +511,16 @@ class NurbsCurve:
                 # First knot
                 dx = next_knot.x - knot.x
                 dy = next_knot.y - knot.y
-                knot.tangent_angle = np.arctan2(dy, dx)
-                mag = np.sqrt(dx**2 + dy**2) * 0.3
+                knot.tangent_angle = math.atan2(dy, dx)
+                mag = math.sqrt(dx**2 + dy**2) * 0.3
                 knot.tangent_magnitude_in = mag
                 knot.tangent_magnitude_out = mag
             elif next_knot is None:
                 # Last knot
                 dx = knot.x - prev_knot.x
                 dy = knot.y - prev_knot.y
-                knot.tangent_angle = np.arctan2(dy, dx)
-                mag = np.sqrt(dx**2 + dy**2) * 0.3
+                knot.tangent_angle = math.atan2(dy, dx)
+                mag = math.sqrt(dx**2 + dy**2) * 0.3
                 knot.tangent_magnitude_in = mag
                 knot.tangent_magnitude_out = mag
             else:
@@ -351,74 +529,69 @@ class NurbsCurve:
                 dy = next_knot.y - prev_knot.y
                 
                 if abs(dx) > 0.001:
-                    knot.tangent_angle = np.arctan2(dy, dx)
+                    knot.tangent_angle = math.atan2(dy, dx)
                     # Magnitude based on distances to neighbors
-                    d1 = np.sqrt((knot.x - prev_knot.x)**2 + (knot.y - prev_knot.y)**2)
-                    d2 = np.sqrt((next_knot.x - knot.x)**2 + (next_knot.y - knot.y)**2)
+                    d1 = math.sqrt((knot.x - prev_knot.x)**2 + (knot.y - prev_knot.y)**2)
+                    d2 = math.sqrt((next_knot.x - knot.x)**2 + (next_knot.y - knot.y)**2)
                     knot.tangent_magnitude_in = d1 * 0.3
                     knot.tangent_magnitude_out = d2 * 0.3
                 else:
-                    knot.tangent_angle = np.pi/2 if dy > 0 else -np.pi/2
+                    knot.tangent_angle = math.pi/2 if dy > 0 else -math.pi/2
                     knot.tangent_magnitude_in = 50.0
                     knot.tangent_magnitude_out = 50.0
             
             knot._update_handles()
     
-    def _hermite_interpolate(self, p0, p1, t0, t1, t):
-        """
-        Hermite interpolation between two points
-        
-        Args:
-            p0, p1: Start and end points (x, y)
-            t0, t1: Start and end tangent vectors (dx, dy)
-            t: Parameter in [0, 1]
-            
-        Returns:
-            Interpolated point (x, y)
-        """
-        # Hermite basis functions
-        h00 = 2*t**3 - 3*t**2 + 1
-        h10 = t**3 - 2*t**2 + t
-        h01 = -2*t**3 + 3*t**2
-        h11 = t**3 - t**2
-        
-        # Interpolate
-        x = h00 * p0[0] + h10 * t0[0] + h01 * p1[0] + h11 * t1[0]
-        y = h00 * p0[1] + h10 * t0[1] + h01 * p1[1] + h11 * t1[1]
-        
-        return (x, y)
-    
     def update_curve(self):
         """Update the curve segments based on current knots"""
         n = len(self.knots)
         if n < 2:
-            self._hermite_segments = []
+            self._segment_array = np.empty((0, 4, 2))
+            self._span_coeffs = np.empty((0, 4, 2))
             self._update_needed = False
             return
         
         # Calculate auto tangents where needed
         self._calculate_auto_tangents()
         
-        # Create Hermite segments between consecutive knots
-        self._hermite_segments = []
-        
-        for i in range(n - 1):
-            k0 = self.knots[i]
-            k1 = self.knots[i + 1]
-            
-            # Get tangent vectors
-            t0 = k0.get_tangent_vector('out')
-            t1 = k1.get_tangent_vector('in')
-            
-            self._hermite_segments.append({
-                'p0': (k0.x, k0.y),
-                'p1': (k1.x, k1.y),
-                't0': t0,
-                't1': t1
-            })
+        # Create Hermite segments between consecutive knots, working on all
+        # knots at once: (p0, t0, p1, t1) per segment
+        points = self.knots_xy()
+        t_in, t_out = self._tangent_vectors()
+        segment_array = np.stack(
+            (points[:-1], t_out[:-1], points[1:], t_in[1:]), axis=1)
+        self._span_coeffs = self._update_span_coeffs(segment_array)
+        self._segment_array = segment_array
         
         self._update_needed = False
     
+    def _update_span_coeffs(self, segment_array):
+        """
+        Get the power basis coefficients for new segment data
+        
+        Only spans whose Hermite data changed since the last update are
+        recomputed. The previous coefficient array is never modified, since
+        it may still be in use by a background preview.
+        
+        Args:
+            segment_array: New (n_segments, 4, 2) segment data
+            
+        Returns:
+            Array of shape (n_segments, 4, 2) with the coefficients per span
+        """
+        old = self._segment_array
+        if old.shape != segment_array.shape:
+            # Knots were added or removed
+            return span_coefficients(segment_array)
+        
+        changed = np.any(old != segment_array, axis=(1, 2))
+        if not changed.any():
+            return self._span_coeffs
+        
+        coeffs = self._span_coeffs.copy()
+        coeffs[changed] = span_coefficients(segment_array[changed])
+        return coeffs
+    
     def evaluate(self, t):
         """
         Evaluate the curve at parameter t
@@ -432,51 +605,74 @@ class NurbsCurve:
         if self._update_needed:
             self.update_curve()
         
-        if not self._hermite_segments:
+        if not len(self._segment_array):
             return None
         
-        # Handle both single value and array input
-        t_array = np.atleast_1d(t)
-        results = []
+        return evaluate_coeffs(self._span_coeffs, t)
+    
+    def _get_basis(self, n_segments, num_points):
+        """
+        Get the cached sampling basis for a number of segments and samples
+        
+        The basis only depends on how uniform parameter values map onto the
+        segments, so it stays valid while knots are moved and only changes
+        when knots are added or removed.
+        """
+        key = (n_segments, num_points)
+        basis = self._basis_cache.get(key)
+        if basis is None:
+            if len(self._basis_cache) >= 8:
+                self._basis_cache.clear()
+            basis = sample_basis(n_segments, num_points)
+            self._basis_cache[key] = basis
+        return basis
+    
+    def sampling_snapshot(self, num_points=100):
+        """
+        Get the data needed to sample the curve with evaluate_basis()
         
-        n_segments = len(self._hermite_segments)
+        The curve is brought up to date first, so this must be called from
+        the thread that edits the knots. The returned coefficient array is
+        never modified afterwards: update_curve() replaces it with a new
+        array instead, so the snapshot can be evaluated in a worker thread
+        while editing continues, and compared by identity with a later
+        snapshot to tell whether the curve changed.
         
-        for t_val in t_array:
-            # Map t to segment
-            if t_val <= 0:
-                seg = self._hermite_segments[0]
-                results.append(seg['p0'])
-            elif t_val >= 1:
-                seg = self._hermite_segments[-1]
-                results.append(seg['p1'])
-            else:
-                # Find which segment t falls into
-                segment_idx = int(t_val * n_segments)
-                if segment_idx >= n_segments:
-                    segment_idx = n_segments - 1
-                
-                # Local t within the segment
-                local_t = (t_val * n_segments) - segment_idx
-                
-                seg = self._hermite_segments[segment_idx]
-                point = self._hermite_interpolate(
-                    seg['p0'], seg['p1'], seg['t0'], seg['t1'], local_t)
-                results.append(point)
-        
-        # Return single value or array based on input
-        if len(results) == 1 and np.isscalar(t):
-            return results[0]
-        else:
-            return np.array(results)
+        Args:
+            num_points: Number of samples
+        
+        Returns:
+            Tuple (span_coeffs, basis), or None if the curve has no segments
+        """
+        if self._update_needed:
+            self.update_curve()
+        
+        n_segments = len(self._segment_array)
+        if not n_segments:
+            return None
+        
+        return self._span_coeffs, self._get_basis(n_segments, num_points)
     
-    def sample(self, num_points=100):
-        """Sample the curve at uniform parameter values"""
+    def sample(self, num_points=100, out=None):
+        """
+        Sample the curve at uniform parameter values
+        
+        Args:
+            num_points: Number of samples
+            out: Optional array of shape (num_points, 2) to write the samples to
+            
+        Returns:
+            Array of shape (num_points, 2) with the sampled points
+        """
         if len(self.knots) < 2:
             return np.array([])
         
-        t = np.linspace(0, 1, num_points)
-        points = self.evaluate(t)
-        return points if points is not None else np.array([])
+        snapshot = self.sampling_snapshot(num_points)
+        if snapshot is None:
+            return np.array([])
+        
+        span_coeffs, basis = snapshot
+        return evaluate_basis(span_coeffs, basis, out)
     
     def adaptive_sample(self, max_error=0.5, min_points=10, max_points=1000):
         """Sample the curve adaptively based on curvature"""
@@ -486,67 +682,58 @@ class NurbsCurve:
         if self._update_needed:
             self.update_curve()
         
-        if not self._hermite_segments:
+        segment_array = self._segment_array
+        if not len(segment_array):
             return np.array([])
         
         # Start with endpoints of each segment
-        sample_points = []
-        sample_params = []
-        
-        n_segments = len(self._hermite_segments)
-        
-        # Add initial points at segment boundaries
-        for i in range(n_segments + 1):
-            t = i / n_segments
-            sample_params.append(t)
-            if i < n_segments:
-                sample_points.append(self._hermite_segments[i]['p0'])
-            else:
-                sample_points.append(self._hermite_segments[-1]['p1'])
-        
-        # Adaptive refinement
-        i = 0
-        while i < len(sample_params) - 1 and len(sample_params) < max_points:
-            t1 = sample_params[i]
-            t2 = sample_params[i + 1]
-            p1 = sample_points[i]
-            p2 = sample_points[i + 1]
-            
-            # Check midpoint
-            t_mid = (t1 + t2) / 2
+        n_segments = len(segment_array)
+        params = np.arange(n_segments + 1) / n_segments
+        points = np.vstack((segment_array[:, 0], segment_array[-1:, 2]))
+        
+        # Adaptive refinement, one level per pass: the midpoints of all
+        # intervals still to be checked are evaluated in a single call, and
+        # only the two halves of each split interval are checked again
+        pending = np.arange(n_segments)
+        while len(pending) and len(params) < max_points:
+            t_mid = (params[pending] + params[pending + 1]) / 2
             p_mid = self.evaluate(t_mid)
             
-            # Linear interpolation at midpoint
-            p_linear = ((np.array(p1) + np.array(p2)) / 2).tolist()
+            # Distance between the curve and the chord at the midpoint
+            chord_mid = (points[pending] + points[pending + 1]) / 2
+            error = np.hypot(*(p_mid - chord_mid).T)
             
-            # Calculate error
-            error = np.sqrt((p_mid[0] - p_linear[0])**2 + (p_mid[1] - p_linear[1])**2)
+            # Split the intervals that are too coarse, leftmost first if
+            # that would exceed max_points
+            split = error > max_error
+            split &= np.cumsum(split) <= max_points - len(params)
+            pending, t_mid, p_mid = pending[split], t_mid[split], p_mid[split]
             
-            if error > max_error:
-                # Insert midpoint
-                sample_params.insert(i + 1, t_mid)
-                sample_points.insert(i + 1, p_mid)
-            else:
-                i += 1
-        
-        # Ensure minimum points
-        while len(sample_points) < min_points:
-            # Find largest gap
-            max_gap = 0
-            max_gap_idx = 0
-            for i in range(len(sample_params) - 1):
-                gap = sample_params[i + 1] - sample_params[i]
-                if gap > max_gap:
-                    max_gap = gap
-                    max_gap_idx = i
+            params = np.insert(params, pending + 1, t_mid)
+            points = np.insert(points, pending + 1, p_mid, axis=0)
+            
+            # Indices of the left halves in the refined arrays, followed by
+            # the right halves
+            left = pending + np.arange(len(pending))
+            pending = np.column_stack((left, left + 1)).ravel()
+        
+        # Ensure minimum points by splitting the largest gaps
+        if len(params) < min_points:
+            gaps = [(t1 - t2, t1, t2) for t1, t2 in zip(params.tolist(), params[1:].tolist())]
+            heapq.heapify(gaps)
+            
+            extra = []
+            while len(params) + len(extra) < min_points:
+                _, t1, t2 = heapq.heappop(gaps)
+                t_new = (t1 + t2) / 2
+                extra.append(t_new)
+                heapq.heappush(gaps, (t1 - t_new, t1, t_new))
+                heapq.heappush(gaps, (t_new - t2, t_new, t2))
             
-            # Insert point in largest gap
-            t_new = (sample_params[max_gap_idx] + sample_params[max_gap_idx + 1]) / 2
-            p_new = self.evaluate(t_new)
-            sample_params.insert(max_gap_idx + 1, t_new)
-            sample_points.insert(max_gap_idx + 1, p_new)
+            order = np.argsort(np.concatenate((params, extra)), kind='stable')
+            points = np.concatenate((points, self.evaluate(np.array(extra))))[order]
         
-        return np.array(sample_points)
+        return points
     
     def to_dict(self):
         """Convert to dictionary for serialization"""
@@ -559,5 +746,123 @@ class NurbsCurve:
         """Create from dictionary (deserialization)"""
         curve = cls()
         curve.knots = [NurbsKnot.from_dict(knot_data) for knot_data in data['knots']]
-        curve._update_needed = True
-        return curve
\ No newline at end of file
+        for knot in curve.knots:
+            knot._curve = curve
+        curve._invalidate()
+        return curve
+
+
+def span_coefficients(segment_array):
+    """
+    Convert Hermite segment data to power basis coefficients
+    
+    Args:
+        segment_array: Array of shape (n_segments, 4, 2) with p0, t0, p1, t1
+        
+    Returns:
+        Array of shape (n_segments, 4, 2) with a, b, c, d per segment
+    """
+    return np.einsum('ij,sjd->sid', _HERMITE_TO_POWER, segment_array)
+
+def span_parameters(n_segments, t):
+    """
+    Locate parameter values on the segments of a curve
+    
+    Args:
+        n_segments: Number of segments in the curve
+        t: Array of parameter values in [0, 1] (values outside are clamped)
+        
+    Returns:
+        Tuple (indices, local_t): the segment index of each parameter value
+        and the local parameter within that segment
+    """
+    # Map t to segment and local t within the segment
+    scaled = np.clip(t, 0.0, 1.0) * n_segments
+    indices = np.minimum(scaled.astype(int), n_segments - 1)
+    local_t = scaled - indices
+    
+    return indices, local_t
+
+def hermite_basis(n_segments, t):
+    """
+    Basis for evaluating a curve at many parameter values
+    
+    Args:
+        n_segments: Number of segments in the curve
+        t: Array of parameter values in [0, 1] (values outside are clamped)
+        
+    Returns:
+        Tuple (indices, weights): the segment index of each parameter value
+        and an array of shape (len(t), 4) with the powers t^3, t^2, t, 1 of
+        the local parameter, matching the span coefficients a, b, c, d
+    """
+    indices, local_t = span_parameters(n_segments, t)
+    weights = np.column_stack((local_t**3, local_t**2, local_t, np.ones_like(local_t)))
+    
+    return indices, weights
+
+def sample_basis(n_segments, num_points):
+    """
+    Basis for uniform sampling of a curve
+    
+    Args:
+        n_segments: Number of segments in the curve
+        num_points: Number of uniformly spaced parameter values in [0, 1]
+        
+    Returns:
+        Tuple (indices, weights) as returned by hermite_basis
+    """
+    return hermite_basis(n_segments, np.linspace(0, 1, num_points))
+
+def evaluate_basis(span_coeffs, basis, out=None):
+    """
+    Evaluate span coefficients with a precomputed basis
+    
+    Only reads its arguments, so it is safe to call from a worker thread on
+    a snapshot returned by NurbsCurve.sampling_snapshot().
+    
+    Args:
+        span_coeffs: Array of shape (n_segments, 4, 2) with a, b, c, d
+        basis: (indices, weights) tuple as returned by hermite_basis
+        out: Optional array of shape (num_points, 2) to write the points to
+        
+    Returns:
+        Array of shape (num_points, 2) with the evaluated points
+    """
+    # Weighted sum of each sample's span coefficients
+    indices, weights = basis
+    return np.einsum('pk,pkd->pd', weights, span_coeffs[indices], out=out)
+
+def evaluate_coeffs(span_coeffs, t):
+    """
+    Evaluate span coefficients at parameter t
+    
+    Args:
+        span_coeffs: Array of shape (n_segments, 4, 2) with a, b, c, d
+        t: Parameter value(s) in [0, 1] or array of values
+        
+    Returns:
+        (x, y) coordinates on the curve or array of coordinates
+    """
+    if len(span_coeffs) == 0:
+        return None
+    
+    # Handle both single value and array input
+    t_array = np.atleast_1d(np.asarray(t, dtype=float))
+    indices, local_t = span_parameters(len(span_coeffs), t_array)
+    
+    # Horner's scheme ((a*t + b)*t + c)*t + d, in place and without the
+    # powers of t that a reusable basis needs
+    coeffs = span_coeffs[indices]
+    local_t = local_t[:, None]
+    points = coeffs[:, 0] * local_t
+    for k in (1, 2):
+        points += coeffs[:, k]
+        points *= local_t
+    points += coeffs[:, 3]
+    
+    # Return single value or array based on input
+    if len(points) == 1 and np.isscalar(t):
+        return tuple(points[0].tolist())
+    else:
+        return points
\ No newline at end of file
@@ -5,6 +5,7 @@ Data sampling module for Plot Digitizer
 Updated to work with Hermite interpolation NURBS
 """
 
+import csv
 import numpy as np
 import pandas as pd
 from utils.axis import Axis, AxisType
@@ -31,7 +32,7 @@ def uniform_sampling(curve, x_axis, y_axis, num_points=100):
         curve.update_curve()
     
     # Check if curve has valid segments
-    if not curve._hermite_segments:
+    if not len(curve._segment_array):
         return pd.DataFrame(columns=['x', 'y'])
     
     # Get the pixel coordinates of all knots
@@ -53,29 +54,43 @@ def uniform_sampling(curve, x_axis, y_axis, num_points=100):
     # Convert x values to pixel coordinates
     x_pixels = np.array([x_axis.value_to_pixel(x) for x in x_values])
     
-    # For each x pixel, find the corresponding y pixel on the curve
-    result_data = []
+    # Sample the curve densely once; for each x pixel the closest sample in x
+    # gives the corresponding y pixel
+    curve_points = curve.sample(1000)
     
-    for x_val, x_px in zip(x_values, x_pixels):
-        # Find the t parameter where the curve has this x coordinate
-        # This is a simple approach: sample the curve densely and find closest point
-        t_values = np.linspace(0, 1, 1000)
-        curve_points = curve.evaluate(t_values)
-        
-        if curve_points is None or len(curve_points) == 0:
-            continue
-        
-        # Find the point with the closest x coordinate
-        distances = np.abs(curve_points[:, 0] - x_px)
-        closest_idx = np.argmin(distances)
-        closest_point = curve_points[closest_idx]
-        
-        # Convert pixel coordinates to axis values
-        y_val = y_axis.pixel_to_value(closest_point[1])
+    if curve_points is None or len(curve_points) == 0:
+        return pd.DataFrame(columns=['x', 'y'])
+    
+    closest_idx = _closest_indices(curve_points[:, 0], x_pixels)
+    
+    # Convert pixel coordinates to axis values
+    y_values = y_axis.pixel_to_value(curve_points[closest_idx, 1])
+    
+    return pd.DataFrame({'x': x_values, 'y': y_values})
+
+def _closest_indices(samples, targets, block_size=256):
+    """
+    Find the sample closest to each target value
+    
+    Works through the targets in blocks so the distance matrix stays small
+    for large point counts.
+    
+    Args:
+        samples: 1D array of sample values
+        targets: 1D array of target values
+        block_size: Number of targets handled per block
         
-        result_data.append({'x': x_val, 'y': y_val})
+    Returns:
+        Array with the index of the closest sample for each target
+    """
+    result = np.empty(len(targets), dtype=int)
     
-    return pd.DataFrame(result_data)
+    for start in range(0, len(targets), block_size):
+        block = targets[start:start + block_size]
+        distances = np.abs(block[:, None] - samples[None, :])
+        result[start:start + block_size] = np.argmin(distances, axis=1)
+    
+    return result
 
 def adaptive_sampling(curve, x_axis, y_axis, max_error=0.5, min_points=10, max_points=1000):
     """
@@ -101,7 +116,7 @@ def adaptive_sampling(curve, x_axis, y_axis, max_error=0.5, min_points=10, max_p
         curve.update_curve()
     
     # Check if curve has valid segments
-    if not curve._hermite_segments:
+    if not len(curve._segment_array):
         return pd.DataFrame(columns=['x', 'y'])
     
     # Get adaptively sampled points in pixel coordinates
@@ -120,20 +135,41 @@ def adaptive_sampling(curve, x_axis, y_axis, max_error=0.5, min_points=10, max_p
     
     return pd.DataFrame(result_data)
 
-def export_to_csv(df, filename, by_column=True):
+def write_csv(file, df, by_column=True, header=True):
+    """
+    Write data as CSV to an open text file
+    
+    Args:
+        file: File object opened in text mode with newline=''
+        df: Pandas DataFrame or dictionary of arrays containing the data
+        by_column: If True, write data by columns (x in first column, y in second)
+                  If False, write data by rows (x in first row, y in second)
+        header: If True, start each column (or row) with its name
+    """
+    writer = csv.writer(file, lineterminator='\n')
+    names = list(df)
+    columns = [df[name].tolist() for name in names]
+    
+    if by_column:
+        if header:
+            writer.writerow(names)
+        writer.writerows(zip(*columns))
+    else:
+        for name, values in zip(names, columns):
+            writer.writerow([name] + values if header else values)
+
+def export_to_csv(df, filename, by_column=True, header=True):
     """
     Export data to CSV file
     
     Args:
-        df: Pandas DataFrame containing the data
+        df: Pandas DataFrame or dictionary of arrays containing the data
         filename: Output filename
         by_column: If True, export data by columns (x in first column, y in second)
                   If False, export data by rows (x in first row, y in second)
+        header: If True, start each column (or row) with its name
     """
-    if by_column:
-        # Default pandas to_csv exports by columns
-        df.to_csv(filename, index=False)
-    else:
-        # Transpose data to export by rows
-        df_t = df.T
-        df_t.to_csv(filename, header=False)
\ No newline at end of file
+    # Stream the rows through a large buffer instead of building the whole
+    # CSV text first
+    with open(filename, 'w', newline='', buffering=1 << 20) as file:
+        write_csv(file, df, by_column, header)
\ No newline at end of file